@@ -6,11 +6,24 @@ import sys
 import os
 import json
 from pathlib import Path
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from core.trading_logic import TradingCalendar
+from core.trading_logic import build_calendar
+from core.ephemeris import get_shared_executor
 from core.reports import ReportGenerator
-from core.astro_engine import calculate_lagna
+from core.statistics import CalendarStatistics
+from core.astro_engine import AstroCalculator, calculate_lagna
+
+with open('config.json', 'r') as f:
+    APP_CONFIG = json.load(f)
+
+# Seconds a session waits for its calendar before giving up
+CALENDAR_TIMEOUT = 300
+
+# Longest date range one session may request, so no request can hold a
+# shared worker for long
+MAX_CALENDAR_DAYS = APP_CONFIG.get('max_calendar_days', 3660)
 
 st.set_page_config(
     page_title="AstroTradeDays",
@@ -337,36 +350,58 @@ if 'generate' not in st.session_state:
     *Built with ❤️ by Market Hacks team*
     """)
 else:
+    n_days = (st.session_state.end_date - st.session_state.start_date).days + 1
+    if n_days < 1:
+        st.error("End date must not be before the start date")
+        st.stop()
+    if n_days > MAX_CALENDAR_DAYS:
+        st.error(f"Date range is {n_days} days; the limit is {MAX_CALENDAR_DAYS}")
+        st.stop()
+    
     with st.spinner('🔮 Calculating...'):
+        future = None
         try:
-            calendar = TradingCalendar(st.session_state.profile_data)
-            df = calendar.generate_calendar(st.session_state.start_date, st.session_state.end_date)
+            # Run in a worker process so concurrent sessions don't share
+            # Swiss Ephemeris state or queue behind each other
+            executor = get_shared_executor(APP_CONFIG.get('executor_workers'))
+            future = executor.submit(
+                build_calendar, st.session_state.profile_data,
+                st.session_state.start_date, st.session_state.end_date
+            )
+            df = future.result(timeout=CALENDAR_TIMEOUT)
             st.success(f"✅ {len(df)} days generated!")
             st.session_state.df = df
+        except FuturesTimeoutError:
+            # Drops the job if it is still queued behind other sessions
+            future.cancel()
+            st.error("⏱️ Calendar generation timed out; try a shorter date range")
+            st.stop()
         except Exception as e:
             st.error(f"Error: {str(e)[:100]}")
             st.stop()
     
     df = st.session_state.df
+    stats = CalendarStatistics(df)
+    summary = stats.summary()
     tabs = st.tabs(["📅 Calendar", "🌔 Day", "📊 Charts", "📥 Export", "📆 Google Cal"])
     
     with tabs[0]:
         st.subheader("📅 Trading Calendar")
-        market_changes = df[df.get('change_during_market', False) == True]
-        if len(market_changes) > 0:
-            st.warning(f"⚠️ {len(market_changes)} market-hour changes")
+        market_changes = summary['nakshatra_changes_market']
+        if market_changes > 0:
+            st.warning(f"⚠️ {market_changes} market-hour changes")
         
         cols = st.columns(5)
         with cols[0]:
-            st.metric("Total", len(df))
+            st.metric("Total", summary['total_days'])
         with cols[1]:
-            st.metric("Trade", len(df[df['recommendation'] == 'TRADE']))
+            st.metric("Trade", summary['trade_days'])
         with cols[2]:
-            st.metric("Light", len(df[df['recommendation'] == 'LIGHT']))
+            st.metric("Light", summary['light_days'])
         with cols[3]:
-            st.metric("Avoid", len(df[df['recommendation'] == 'AVOID']))
+            st.metric("Avoid", summary['avoid_days'])
         with cols[4]:
-            st.metric("Changes", len(market_changes))
+            st.metric("Changes", market_changes)
         
         st.markdown("---")
         show_only = st.checkbox("Show changes only", False)
@@ -408,12 +443,19 @@ else:
             
             st.markdown("---")
             st.write(row['reasons'])
+            
+            profile = st.session_state.profile_data
+            if profile.get('lat') is not None and profile.get('lon') is not None:
+                st.markdown("#### 🌅 Lagna During Market Hours")
+                timeline = AstroCalculator().get_lagna_timeline(selected_date, profile['lat'], profile['lon'])
+                for lagna in timeline:
+                    st.write(f"**{lagna['start'].strftime('%H:%M')} – {lagna['end'].strftime('%H:%M')}** {lagna['sign']}")
     
     with tabs[2]:
         st.subheader("📊 Analytics")
-        rec_counts = df['recommendation'].value_counts()
-        fig = px.pie(values=rec_counts.values, names=rec_counts.index, title="Distribution",
-                     color=rec_counts.index, color_discrete_map={'TRADE': '#28a745', 'LIGHT': '#ffc107', 'AVOID': '#dc3545', 'CLOSED': '#6c757d'})
+        rec_counts = stats.recommendation_counts()
+        fig = px.pie(values=list(rec_counts.values()), names=list(rec_counts), title="Distribution",
+                     color=list(rec_counts), color_discrete_map={'TRADE': '#28a745', 'LIGHT': '#ffc107', 'AVOID': '#dc3545', 'CLOSED': '#6c757d'})
         st.plotly_chart(fig, use_container_width=True)
     
     with tabs[3]:
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Time batch calendar generation against a loop over TradingCalendar
+Usage: python benchmark_calendars.py [n_profiles] [year]
+
+Profiles are synthetic birth data spread over five cities. The sky
+calendar is computed and cached before timing, so the figures compare
+only the per-profile work.
+"""
+import sys
+import os
+import time
+import random
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.trading_logic import TradingCalendar, generate_calendars
+
+CITIES = [
+    (28.661, 77.133),  # Delhi
+    (19.076, 72.878),  # Mumbai
+    (12.972, 77.595),  # Bengaluru
+    (22.573, 88.364),  # Kolkata
+    (13.083, 80.271)   # Chennai
+]
+
+
+def synthetic_profiles(n, seed=0):
+    """n birth profiles with random dates and times, in CITIES"""
+    rng = random.Random(seed)
+    profiles = {}
+    for i in range(n):
+        dob = date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 50))
+        lat, lon = CITIES[i % len(CITIES)]
+        profiles[f'profile_{i}'] = {
+            'dob': dob.isoformat(),
+            'tob': f'{rng.randrange(24):02d}:{rng.randrange(60):02d}',
+            'lat': lat,
+            'lon': lon
+        }
+    return profiles
+
+
+def timed(label, run):
+    started = time.perf_counter()
+    result = run()
+    print(f"   {label:<30} {time.perf_counter() - started:6.1f} s")
+    return result
+
+
+def main():
+    n_profiles = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    year = int(sys.argv[2]) if len(sys.argv) > 2 else 2025
+    start, end = f'{year}-01-01', f'{year}-12-31'
+    profiles = synthetic_profiles(n_profiles)
+
+    print(f"🌙 {n_profiles} profiles in {len(CITIES)} cities over {year}")
+    timed("sky calendar (warm-up)", lambda: TradingCalendar(profiles['profile_0']).get_sky_calendar(start, end))
+
+    looped = timed("loop over TradingCalendar", lambda: {
+        key: TradingCalendar(profile).generate_calendar(start, end) for key, profile in profiles.items()
+    })
+    batch = timed("generate_calendars (dict)", lambda: generate_calendars(profiles, start, end))
+    long_frame = timed("generate_calendars (long)", lambda: generate_calendars(profiles, start, end, long_format=True))
+
+    matches = all(batch[key].equals(df) for key, df in looped.items()) and len(long_frame) == n_profiles * len(looped['profile_0'])
+    print(f"✅ Outputs match the loop: {matches}")
+
+
+if __name__ == '__main__':
+    main()
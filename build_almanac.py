@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed almanac that AstroCalculator memory-maps at runtime
+Usage: python build_almanac.py [start_year] [end_year] [output_path]
+"""
+import sys
+import os
+import time
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.astro_engine import AstroCalculator
+from core.almanac import DEFAULT_ALMANAC_PATH, write_almanac
+from core.timezones import date_to_jd
+
+
+def main():
+    start_year = int(sys.argv[1]) if len(sys.argv) > 1 else 1900
+    end_year = int(sys.argv[2]) if len(sys.argv) > 2 else 2100
+    output_path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_ALMANAC_PATH
+
+    print(f"🌙 Building almanac {start_year}-{end_year} -> {output_path}")
+    started = time.time()
+
+    # Solve from the ephemeris, never from an existing almanac
+    calc = AstroCalculator(almanac_path=None)
+    write_almanac(
+        output_path, calc,
+        date_to_jd(date(start_year, 1, 1)), date_to_jd(date(end_year + 1, 1, 1)),
+        progress=lambda message: print(f"   {message}...")
+    )
+
+    size_mb = os.path.getsize(output_path) / 1e6
+    print(f"✅ Wrote {size_mb:.1f} MB in {time.time() - started:.0f}s")
+
+
+if __name__ == '__main__':
+    main()
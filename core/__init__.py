@@ -1,8 +1,14 @@
 """
 Core modules for AstroTrade Personal Assistant
 """
-from .astro_engine import AstroCalculator
-from .trading_logic import TradingCalendar
+from .astro_engine import AstroCalculator, SkySnapshot, AstroEvent, NatalChart, get_natal_chart
+from .trading_logic import TradingCalendar, CalendarDay, build_calendar, generate_calendars
 from .reports import ReportGenerator
+from .ephemeris import EphemerisExecutor, get_shared_executor
+from .holidays import HolidayCalendar, get_holiday_calendar
+from .rules import RuleSet, get_rules
+from .statistics import CalendarStatistics
 
-__all__ = ['AstroCalculator', 'TradingCalendar', 'ReportGenerator']
+__all__ = ['AstroCalculator', 'SkySnapshot', 'AstroEvent', 'NatalChart', 'get_natal_chart', 'TradingCalendar', 'CalendarDay', 'build_calendar', 'generate_calendars', 'ReportGenerator',
+           'EphemerisExecutor', 'get_shared_executor', 'HolidayCalendar', 'get_holiday_calendar', 'RuleSet', 'get_rules',
+           'CalendarStatistics']
@@ -0,0 +1,211 @@
+"""
+Precomputed binary almanac of astrological boundary events
+
+File layout (little-endian, version 1):
+    header       HEADER_DTYPE
+    section table SECTION_DTYPE x n_sections
+    per section  float64 JDs[count], then int16 values[count], 8-byte aligned
+
+Each section is a sorted transition list: nakshatra padas, tithis, yogas,
+Moon signs, one per planet for retrograde stations, and solar/lunar
+eclipses. The runtime memory-maps the file and bisects the JD arrays in
+place, so nothing is copied or recomputed at startup.
+"""
+import os
+import numpy as np
+import swisseph as swe
+from .transitions import TransitionIndex
+
+ALMANAC_MAGIC = b'ATALMNAC'
+ALMANAC_VERSION = 1
+DEFAULT_ALMANAC_PATH = 'almanac/almanac.bin'
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('n_sections', '<u4'),
+    ('jd_start', '<f8'),
+    ('jd_end', '<f8'),
+    ('ayanamsha', 'S16')
+])
+
+SECTION_DTYPE = np.dtype([
+    ('name', 'S24'),
+    ('count', '<u8'),
+    ('offset', '<u8'),
+    ('initial', '<i4'),
+    ('reserved', '<u4')
+])
+
+# Sections solved with AstroCalculator.find_boundaries
+BOUNDARY_SECTIONS = ['pada', 'tithi', 'yoga', 'moon_sign']
+
+# Eclipse sections store the swisseph eclipse type flags as the value
+ECLIPSE_SECTIONS = ['solar_eclipse', 'lunar_eclipse']
+
+
+def station_section(planet):
+    """Section name for a planet's retrograde stations"""
+    return f'station:{planet}'
+
+
+class MappedTransitionIndex(TransitionIndex):
+    """TransitionIndex over memory-mapped arrays, queried with searchsorted"""
+
+    def __init__(self, jd_start, jd_end, jds, values, initial):
+        self.jd_start = jd_start
+        self.jd_end = jd_end
+        self.jds = jds
+        self.values = values
+        self.initial = initial
+
+    def value_at(self, jd):
+        """Value in force at a Julian Day"""
+        i = int(np.searchsorted(self.jds, jd, side='right'))
+        return int(self.values[i - 1]) if i > 0 else self.initial
+
+    def between(self, jd_start, jd_end):
+        """Transitions with jd_start <= jd < jd_end, as (jd, new_value) tuples"""
+        lo, hi = np.searchsorted(self.jds, [jd_start, jd_end], side='left')
+        return list(zip(self.jds[lo:hi].tolist(), self.values[lo:hi].tolist()))
+
+    def merge(self, other):
+        """Mapped indexes are read-only; merging copies into a plain index"""
+        plain = TransitionIndex(self.jd_start, self.jd_end, self.jds.tolist(), self.values.tolist(), self.initial)
+        return plain.merge(other)
+
+
+class Almanac:
+    """Read-only, memory-mapped view of an almanac file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+
+        header = self._map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+        if header['magic'] != ALMANAC_MAGIC:
+            raise ValueError(f"{path} is not an almanac file")
+        if header['version'] != ALMANAC_VERSION:
+            raise ValueError(f"{path} has almanac version {header['version']}, expected {ALMANAC_VERSION}")
+
+        self.jd_start = float(header['jd_start'])
+        self.jd_end = float(header['jd_end'])
+        self.ayanamsha = header['ayanamsha'].decode()
+
+        table_start = HEADER_DTYPE.itemsize
+        table_end = table_start + int(header['n_sections']) * SECTION_DTYPE.itemsize
+        table = self._map[table_start:table_end].view(SECTION_DTYPE)
+
+        self.sections = {}
+        for entry in table:
+            count = int(entry['count'])
+            offset = int(entry['offset'])
+            values_offset = offset + 8 * count
+            self.sections[entry['name'].decode()] = MappedTransitionIndex(
+                self.jd_start, self.jd_end,
+                self._map[offset:values_offset].view('<f8'),
+                self._map[values_offset:values_offset + 2 * count].view('<i2'),
+                int(entry['initial'])
+            )
+
+    def covers(self, jd_start, jd_end):
+        """Check whether the almanac spans the given window"""
+        return self.jd_start <= jd_start and jd_end <= self.jd_end
+
+    def index(self, name, jd_start, jd_end):
+        """Section index if the almanac has it and covers the window"""
+        section = self.sections.get(name)
+        if section is None or not self.covers(jd_start, jd_end):
+            return None
+        return section
+
+
+_ALMANACS = {}
+
+
+def load_almanac(path=DEFAULT_ALMANAC_PATH):
+    """Memory-map an almanac once per process; None if the file is missing"""
+    if path not in _ALMANACS:
+        _ALMANACS[path] = Almanac(path) if os.path.exists(path) else None
+    return _ALMANACS[path]
+
+
+def find_eclipses(jd_start, jd_end, lunar=False):
+    """Times of maximum and type flags of global solar or lunar eclipses"""
+    find = swe.lun_eclipse_when if lunar else swe.sol_eclipse_when_glob
+    eclipses = []
+    jd = jd_start
+
+    while True:
+        ecl_type, tret = find(jd)
+        if tret[0] >= jd_end:
+            break
+        eclipses.append((tret[0], ecl_type))
+        jd = tret[0] + 20.0  # Eclipses are at least a fortnight apart
+
+    return eclipses
+
+
+def write_almanac(path, calc, jd_start, jd_end, progress=None):
+    """
+    Precompute every boundary event between two JDs into an almanac file
+    calc is an AstroCalculator whose ayanamsha the file records
+    """
+    def report(message):
+        if progress:
+            progress(message)
+
+    sections = []
+    calc.prepare_range(jd_start - 1.0, jd_end + 1.0)
+
+    for kind in BOUNDARY_SECTIONS:
+        report(f"Solving {kind} boundaries")
+        crossings = calc._solve_boundaries(kind, jd_start, jd_end)
+        initial = calc._boundary_index(kind, jd_start)
+        sections.append((kind, crossings, initial))
+
+    report("Solving retrograde stations")
+    for planet, index in calc.build_station_index(jd_start, jd_end).items():
+        items = index.between(jd_start, jd_end)
+        sections.append((station_section(planet), [(jd, int(v)) for jd, v in items], int(index.value_at(jd_start))))
+
+    report("Finding eclipses")
+    with calc.ephemeris():
+        sections.append(('solar_eclipse', find_eclipses(jd_start, jd_end), -1))
+        sections.append(('lunar_eclipse', find_eclipses(jd_start, jd_end, lunar=True), -1))
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = ALMANAC_MAGIC
+    header['version'] = ALMANAC_VERSION
+    header['n_sections'] = len(sections)
+    header['jd_start'] = jd_start
+    header['jd_end'] = jd_end
+    header['ayanamsha'] = calc.ayanamsha.encode()
+
+    table = np.zeros(len(sections), dtype=SECTION_DTYPE)
+    offset = HEADER_DTYPE.itemsize + len(sections) * SECTION_DTYPE.itemsize
+    offset += -offset % 8
+    blobs = []
+
+    for i, (name, items, initial) in enumerate(sections):
+        jds = np.array([jd for jd, _ in items], dtype='<f8')
+        values = np.array([value for _, value in items], dtype='<i2')
+        table[i] = (name.encode(), len(items), offset, initial, 0)
+
+        blob = jds.tobytes() + values.tobytes()
+        blob += b'\0' * (-len(blob) % 8)
+        blobs.append(blob)
+        offset += len(blob)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(table.tobytes())
+        f.write(b'\0' * (-f.tell() % 8))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+    _ALMANACS.pop(path, None)
+    return path
@@ -6,16 +6,215 @@ from datetime import datetime, timedelta
 import pytz
 import math
 import json
+import heapq
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from numbers import Real
+from types import MappingProxyType
+import numpy as np
+from .chebyshev import ChebyshevSeries
+from .transitions import TransitionIndex
+from .ephemeris import ephemeris_context, SIDEREAL_MODES
+from .timezones import date_to_jd, get_offsets, julian_days
+from .caches import cached, store
+from .almanac import DEFAULT_ALMANAC_PATH, load_almanac, find_eclipses, station_section
+
+PLANET_IDS = {
+    'Sun': swe.SUN,
+    'Moon': swe.MOON,
+    'Mercury': swe.MERCURY,
+    'Venus': swe.VENUS,
+    'Mars': swe.MARS,
+    'Jupiter': swe.JUPITER,
+    'Saturn': swe.SATURN
+}
+
+# Segment length in days and polynomial degree for interpolated bodies
+CHEBYSHEV_FITS = {
+    'Moon': (4.0, 14),
+    'Sun': (16.0, 10)
+}
+
+# Segment length and degree for the ayanamsha offset; precession and
+# nutation are smooth enough that this fits to ~1e-8 degrees
+AYANAMSHA_FIT = (8.0, 8)
+
+# Boundary spacing in degrees for each panchanga element
+BOUNDARY_SPANS = {
+    'nakshatra': 360.0 / 27.0,
+    'pada': 360.0 / 108.0,
+    'tithi': 12.0,
+    'yoga': 360.0 / 27.0,
+    'moon_sign': 30.0
+}
+
+BOUNDARY_TOLERANCE = 1e-6  # days, ~0.1 seconds
+BOUNDARY_MAX_ITER = 20
+
+# Planets that can turn retrograde, with a speed sampling step in days
+# shorter than their shortest retrograde or direct spell
+STATION_STEPS = {
+    'Mercury': 4.0,
+    'Venus': 8.0,
+    'Mars': 10.0,
+    'Jupiter': 15.0,
+    'Saturn': 15.0
+}
+
+STATION_SPEED_TOLERANCE = 1e-7  # degrees per day
+STATION_MAX_ITER = 50
+
+# Days get_next_station looks ahead, longer than each planet's longest
+# spell between stations (Venus up to ~540 days direct, Mars ~720)
+STATION_LOOKAHEADS = {
+    'Mercury': 200.0,
+    'Venus': 600.0,
+    'Mars': 800.0,
+    'Jupiter': 400.0,
+    'Saturn': 400.0
+}
+
+# Moon phases by 45-degree step of Moon-Sun elongation
+MOON_PHASES = [
+    "New Moon", "Waxing Crescent", "First Quarter", "Waxing Gibbous",
+    "Full Moon", "Waning Gibbous", "Last Quarter", "Waning Crescent"
+]
+
+# Weekday lords, Monday first
+DAY_LORDS = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+
+# Sunrise/sunset cache keyed by (lat, lon, date), coordinates rounded to
+# SUN_TIMES_PRECISION decimals (~1 km), at most SUN_TIMES_CACHE_SIZE days
+SUN_TIMES_PRECISION = 2
+SUN_TIMES_CACHE_SIZE = 65536
+_SUN_TIMES = {}
+
+# Sidereal time advances this many sidereal days per solar day
+SIDEREAL_DAY_RATIO = 1.00273790935
+
+# Sidereal time, obliquity and ayanamsha keyed by (ayanamsha, JD); they are
+# location-independent, so every city's lagna timeline reuses them. At
+# most SIDEREAL_CACHE_SIZE session starts
+SIDEREAL_CACHE_SIZE = 4096
+_SIDEREAL_CONSTANTS = {}
+
+# Tropical Chebyshev series keyed by body; they do not depend on the
+# ayanamsha, so every calculator derives its sidereal series from them
+_TROPICAL_SERIES = {}
+
+# True ayanamsha (including nutation) keyed by (ayanamsha, JD), at most
+# AYANAMSHA_CACHE_SIZE values
+AYANAMSHA_CACHE_SIZE = 65536
+_AYANAMSHAS = {}
+
+# Moon pada transition indexes shared by every calculator, keyed by
+# ayanamsha; each key holds a list of disjoint indexes sorted by start
+_TRANSITION_INDEXES = {}
+
+# Retrograde station indexes, keyed by (ayanamsha, planet), also lists of
+# disjoint indexes sorted by start
+_STATION_INDEXES = {}
+
+# One boundary event; time is local, index is the new state's index
+AstroEvent = namedtuple('AstroEvent', ['jd', 'time', 'kind', 'index', 'name'])
+
+# Event kinds iter_events can merge
+EVENT_KINDS = ['nakshatra', 'pada', 'tithi', 'yoga', 'moon_sign', 'hora']
+
+# Birth charts kept by get_natal_chart, least recently used dropped first
+NATAL_CACHE_SIZE = 4096
+
+class SkySnapshot:
+    """
+    Every body's sidereal longitude and speed at one instant
+    Built once per JD so derived panchanga values share one ephemeris fetch
+    """
+    __slots__ = ('jd', 'ayanamsha', 'longitudes', 'speeds')
+    
+    def __init__(self, jd, ayanamsha, longitudes, speeds):
+        self.jd = jd
+        self.ayanamsha = ayanamsha
+        self.longitudes = longitudes
+        self.speeds = speeds
+    
+    def __repr__(self):
+        return f"SkySnapshot(jd={self.jd:.5f}, bodies={list(self.longitudes)})"
+
+class NatalChart:
+    """
+    Birth chart computed once from birth data
+    Holds the Moon's nakshatra and sign, the lagna (None without a birth
+    place) and every body's sidereal longitude. Get instances through
+    get_natal_chart, which memoizes them and hands the same instance to
+    every caller, so charts are immutable: attributes cannot be set and
+    moon_nakshatra and positions are read-only mappings
+    """
+    __slots__ = ('dob', 'tob', 'lat', 'lon', 'ayanamsha', 'tz', 'jd',
+                 'moon_nakshatra', 'moon_sign', 'lagna', 'positions')
+    
+    def __init__(self, dob, tob, lat, lon, ayanamsha='LAHIRI', tz='Asia/Kolkata'):
+        calc = AstroCalculator(ayanamsha, almanac_path=None)
+        jd = float(julian_days([dob], tob, tz)[0])
+        positions = MappingProxyType(dict(calc.get_snapshot(jd).longitudes))
+        moon_long = positions['Moon']
+        
+        fields = {
+            'dob': dob,
+            'tob': tob,
+            'lat': lat,
+            'lon': lon,
+            'ayanamsha': ayanamsha,
+            'tz': tz,
+            'jd': jd,
+            'moon_nakshatra': MappingProxyType(calc.get_nakshatra(moon_long)),
+            'moon_sign': calc.get_moon_sign(moon_long),
+            'lagna': _lagna_sign(jd, lat, lon, ayanamsha) if lat is not None and lon is not None else None,
+            'positions': positions
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"NatalChart is immutable; cannot set {name!r}")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"NatalChart is immutable; cannot delete {name!r}")
+    
+    def _key(self):
+        """Birth data the chart is computed from"""
+        return (self.dob, self.tob, self.lat, self.lon, self.ayanamsha, self.tz)
+    
+    def __eq__(self, other):
+        return isinstance(other, NatalChart) and self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __reduce__(self):
+        # Unpickling and copying go back through the shared cache
+        return (_natal_chart, self._key())
+    
+    def __repr__(self):
+        return f"NatalChart({self.dob} {self.tob}, moon={self.moon_nakshatra['name']}, lagna={self.lagna})"
 
 class AstroCalculator:
-    def __init__(self, ayanamsha='LAHIRI'):
-        """Initialize Swiss Ephemeris with Lahiri Ayanamsha"""
-        # Set ephemeris path (will use default if not set)
-        swe.set_ephe_path('')  # Use built-in ephemeris
+    def __init__(self, ayanamsha='LAHIRI', almanac_path=DEFAULT_ALMANAC_PATH):
+        """
+        Calculator for one ayanamsha, any key of SIDEREAL_MODES
+        Swiss Ephemeris settings are process-global, so nothing is set here;
+        each calculation applies this calculator's settings under the
+        ephemeris lock
+        """
+        if ayanamsha not in SIDEREAL_MODES:
+            raise ValueError(f"Unsupported ayanamsha: {ayanamsha}")
+        self.ayanamsha = ayanamsha
+        self.almanac_path = almanac_path
         
-        # Set Ayanamsha
-        if ayanamsha == 'LAHIRI':
-            swe.set_sid_mode(swe.SIDM_LAHIRI)
+        # Precomputed almanac, used wherever it covers a query
+        self.almanac = load_almanac(almanac_path) if almanac_path else None
+        if self.almanac is not None and self.almanac.ayanamsha != ayanamsha:
+            self.almanac = None
         
         # Load nakshatras
         self.nakshatras = [
@@ -31,51 +230,190 @@ class AstroCalculator:
             "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
         ]
         
+        self.tithi_names = [
+            "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
+            "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
+            "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima",
+            "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
+            "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
+            "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"
+        ]
+        
+        self.yoga_names = [
+            "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana",
+            "Atiganda", "Sukarma", "Dhriti", "Shoola", "Ganda",
+            "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+            "Siddhi", "Vyatipata", "Variyan", "Parigha", "Shiva",
+            "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma",
+            "Indra", "Vaidhriti"
+        ]
+        
         self.hora_lords = ["Sun", "Venus", "Mercury", "Moon", "Saturn", "Jupiter", "Mars"]
         
+        # Chebyshev caches filled by prepare_range
+        self.interpolated = {}
+        
+    def ephemeris(self):
+        """Context holding the ephemeris lock with this calculator's settings"""
+        return ephemeris_context(self.ayanamsha)
+    
     def get_julian_day(self, dt, tz='Asia/Kolkata'):
         """Convert datetime to Julian Day"""
         if isinstance(dt, str):
             dt = datetime.fromisoformat(dt)
         
-        # Convert to UTC
+        # Wall-clock times go through the zone's cached offset table
         if dt.tzinfo is None:
-            local_tz = pytz.timezone(tz)
-            dt = local_tz.localize(dt)
+            return float(get_offsets(tz).to_utc(date_to_jd(dt)))
         
+        # Convert to UTC
         dt_utc = dt.astimezone(pytz.UTC)
+        return date_to_jd(dt_utc.replace(tzinfo=None))
+    
+    def get_julian_days(self, dates, wall_time, tz='Asia/Kolkata'):
+        """Julian Days for the same local wall-clock time on many dates"""
+        return julian_days(dates, wall_time, tz)
+    
+    def prepare_range(self, jd_start, jd_end):
+        """
+        Fit Chebyshev caches for the Moon and Sun over a Julian Day span
+        Later position queries inside the span skip the ephemeris entirely
+        """
+        # Sidereal longitude is tropical longitude minus the ayanamsha, so
+        # the expensive tropical fit is done once per process and only the
+        # offset is fitted per ayanamsha
+        # Each sidereal series is fitted up to its own rounded-up end, so
+        # the tropical and offset series it samples must reach that far too
+        fit_ends = {
+            body: ChebyshevSeries.span_end(jd_start, jd_end, segment_days)
+            for body, (segment_days, _) in CHEBYSHEV_FITS.items()
+        }
+        offset = ChebyshevSeries(self.get_ayanamshas, jd_start, max(fit_ends.values()), *AYANAMSHA_FIT)
         
-        jd = swe.julday(
-            dt_utc.year, 
-            dt_utc.month, 
-            dt_utc.day,
-            dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0
-        )
-        return jd
+        for body, (segment_days, degree) in CHEBYSHEV_FITS.items():
+            tropical = self._tropical_series(body, jd_start, fit_ends[body])
+            sample = lambda jds, tropical=tropical: tropical.longitude(jds) - offset.longitude(jds)
+            self.interpolated[body] = ChebyshevSeries(sample, jd_start, fit_ends[body], segment_days, degree)
+    
+    def _tropical_series(self, body, jd_start, jd_end):
+        """Shared tropical Chebyshev series for a body covering a span"""
+        series = _TROPICAL_SERIES.get(body)
+        if series is None or not series.covers([jd_start, jd_end]):
+            segment_days, degree = CHEBYSHEV_FITS[body]
+            sample = lambda jds: self._calc_positions(jds, body, sidereal=False)[0]
+            series = ChebyshevSeries(sample, jd_start, jd_end, segment_days, degree)
+            _TROPICAL_SERIES[body] = series
+        return series
+    
+    def get_ayanamshas(self, jds):
+        """
+        True ayanamsha in degrees at each Julian Day, cached per JD
+        Tropical longitude minus this matches swisseph's sidereal output
+        """
+        jds = np.atleast_1d(np.asarray(jds, dtype=float)).tolist()
+        values = [_AYANAMSHAS.get((self.ayanamsha, jd)) for jd in jds]
+        missing = [i for i, value in enumerate(values) if value is None]
+        
+        if missing:
+            with self.ephemeris():
+                for i in missing:
+                    values[i] = swe.get_ayanamsa_ex_ut(jds[i], 0)[1]
+            for i in missing:
+                store(_AYANAMSHAS, AYANAMSHA_CACHE_SIZE, (self.ayanamsha, jds[i]), values[i])
+        
+        return np.array(values)
+    
+    def _series_for(self, body, jd):
+        """Return the Chebyshev cache for a body if it covers the given JD"""
+        series = self.interpolated.get(body)
+        if series is not None and series.jd_start <= jd <= series.jd_end:
+            return series
+        return None
+    
+    def _calc_positions(self, jds, body, sidereal=True):
+        """Longitudes and speeds for one body straight from Swiss Ephemeris"""
+        planet_id = PLANET_IDS[body]
+        flags = swe.FLG_SIDEREAL | swe.FLG_SPEED if sidereal else swe.FLG_SPEED
+        longitudes = np.empty(len(jds))
+        speeds = np.empty(len(jds))
+        
+        with self.ephemeris():
+            for row, jd in enumerate(jds):
+                result = swe.calc_ut(jd, planet_id, flags)[0]
+                longitudes[row] = result[0]
+                speeds[row] = result[3]
+        
+        return longitudes, speeds
     
     def get_moon_position(self, jd):
         """Get Moon's sidereal longitude"""
-        result = swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL)
+        series = self._series_for('Moon', jd)
+        if series is not None:
+            return series.longitude_at(jd)
+        
+        with self.ephemeris():
+            result = swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL)
         return result[0][0]  # Longitude in degrees
     
     def get_planet_position(self, jd, planet):
         """Get planet position"""
-        planet_ids = {
-            'Sun': swe.SUN,
-            'Moon': swe.MOON,
-            'Mercury': swe.MERCURY,
-            'Venus': swe.VENUS,
-            'Mars': swe.MARS,
-            'Jupiter': swe.JUPITER,
-            'Saturn': swe.SATURN
-        }
-        
-        if planet not in planet_ids:
+        if planet not in PLANET_IDS:
             return None
         
-        result = swe.calc_ut(jd, planet_ids[planet], swe.FLG_SIDEREAL)
+        series = self._series_for(planet, jd)
+        if series is not None:
+            return series.longitude_at(jd)
+        
+        with self.ephemeris():
+            result = swe.calc_ut(jd, PLANET_IDS[planet], swe.FLG_SIDEREAL)
         return result[0][0]
     
+    def get_positions(self, jds, bodies):
+        """
+        Get sidereal longitudes and daily speeds for many Julian Days at once
+        Returns two arrays of shape (len(jds), len(bodies))
+        """
+        jds = np.atleast_1d(np.asarray(jds, dtype=float))
+        longitudes = np.empty((len(jds), len(bodies)))
+        speeds = np.empty((len(jds), len(bodies)))
+        
+        for col, body in enumerate(bodies):
+            series = self.interpolated.get(body)
+            if series is not None and series.covers(jds):
+                longitudes[:, col] = series.longitude(jds)
+                speeds[:, col] = series.speed(jds)
+            else:
+                longitudes[:, col], speeds[:, col] = self._calc_positions(jds, body)
+        
+        return longitudes, speeds
+    
+    def get_snapshots(self, jds, bodies=None):
+        """Build one SkySnapshot per Julian Day from a single batched fetch"""
+        bodies = list(bodies or PLANET_IDS)
+        jds = np.atleast_1d(np.asarray(jds, dtype=float))
+        longitudes, speeds = self.get_positions(jds, bodies)
+        ayanamshas = self.get_ayanamshas(jds).tolist()
+        
+        return [
+            SkySnapshot(
+                jd,
+                ayanamshas[row],
+                dict(zip(bodies, longitudes[row].tolist())),
+                dict(zip(bodies, speeds[row].tolist()))
+            )
+            for row, jd in enumerate(jds.tolist())
+        ]
+    
+    def get_snapshot(self, jd, bodies=None):
+        """Build a SkySnapshot for a single Julian Day"""
+        return self.get_snapshots([jd], bodies)[0]
+    
+    def _as_snapshot(self, jd, bodies=('Sun', 'Moon')):
+        """Accept either a SkySnapshot or a Julian Day"""
+        if isinstance(jd, SkySnapshot):
+            return jd
+        return self.get_snapshot(jd, bodies)
+    
     def get_nakshatra(self, longitude):
         """Get Nakshatra from longitude"""
         nakshatra_span = 360.0 / 27.0  # 13.333... degrees per nakshatra
@@ -89,6 +427,199 @@ class AstroCalculator:
             'longitude': longitude
         }
     
+    def get_nakshatra_at(self, jd):
+        """
+        Get the Moon's Nakshatra at a Julian Day
+        Answered from the transition index when it covers jd, in which
+        case no longitude is computed and 'longitude' is None
+        """
+        index = self.get_transition_index(jd, jd)
+        if index is None:
+            return self.get_nakshatra(self.get_moon_position(jd))
+        
+        pada_index = index.value_at(jd)
+        return {
+            'name': self.nakshatras[pada_index // 4],
+            'index': pada_index // 4,
+            'pada': pada_index % 4 + 1,
+            'longitude': None
+        }
+    
+    def _extend_shared_index(self, cache, key, jd_start, jd_end, build_part):
+        """
+        Make sure a process-wide TransitionIndex covers a span
+        build_part(span_start, span_end) solves one uncovered stretch. Only
+        indexes that touch or overlap the span are extended; a distant span
+        gets an index of its own rather than filling the gap in between
+        """
+        index = _shared_index(cache, key, jd_start, jd_end)
+        if index is not None:
+            return index
+        
+        indexes = cache.get(key, [])
+        touching = [part for part in indexes if part.jd_start <= jd_end and jd_start <= part.jd_end]
+        
+        # Only solve the parts of the span no touching index reaches
+        parts = list(touching)
+        cursor = jd_start
+        for part in touching:
+            if part.jd_start > cursor:
+                parts.append(build_part(cursor, part.jd_start))
+            cursor = max(cursor, part.jd_end)
+        if cursor < jd_end:
+            parts.append(build_part(cursor, jd_end))
+        
+        parts.sort(key=lambda part: part.jd_start)
+        index = parts[0]
+        for part in parts[1:]:
+            index = index.merge(part)
+        
+        others = [part for part in indexes if part not in touching]
+        cache[key] = sorted(others + [index], key=lambda part: part.jd_start)
+        return index
+    
+    def build_transition_index(self, jd_start, jd_end):
+        """
+        Solve every Moon pada transition over a span once and share it
+        The index is process-wide, so every profile reuses the same schedule
+        """
+        mapped = self._almanac_index('pada', jd_start, jd_end)
+        if mapped is not None:
+            return mapped
+        
+        def build_part(span_start, span_end):
+            crossings = self._solve_boundaries('pada', span_start, span_end)
+            return TransitionIndex(
+                span_start, span_end,
+                [jd for jd, _ in crossings],
+                [value for _, value in crossings],
+                self._boundary_index('pada', span_start)
+            )
+        
+        return self._extend_shared_index(_TRANSITION_INDEXES, self.ayanamsha, jd_start, jd_end, build_part)
+    
+    def get_transition_index(self, jd_start, jd_end):
+        """Return the almanac or shared transition index if it covers the window"""
+        index = _shared_index(_TRANSITION_INDEXES, self.ayanamsha, jd_start, jd_end)
+        if index is not None:
+            return index
+        return self._almanac_index('pada', jd_start, jd_end)
+    
+    def _almanac_index(self, section, jd_start, jd_end):
+        """Memory-mapped almanac section if it covers the window"""
+        if self.almanac is None:
+            return None
+        return self.almanac.index(section, jd_start, jd_end)
+    
+    def _planet_speed(self, jd, planet):
+        """Daily motion in sidereal longitude"""
+        with self.ephemeris():
+            result = swe.calc_ut(jd, PLANET_IDS[planet], swe.FLG_SIDEREAL | swe.FLG_SPEED)
+        return result[0][3]
+    
+    def _solve_station(self, planet, jd_low, jd_high, speed_low, speed_high):
+        """Find where a planet's speed crosses zero (Illinois regula falsi)"""
+        side = 0
+        jd = jd_low
+        
+        for _ in range(STATION_MAX_ITER):
+            jd = (jd_low * speed_high - jd_high * speed_low) / (speed_high - speed_low)
+            speed = self._planet_speed(jd, planet)
+            if abs(speed) < STATION_SPEED_TOLERANCE or jd_high - jd_low < BOUNDARY_TOLERANCE:
+                break
+            
+            if (speed < 0) == (speed_high < 0):
+                jd_high, speed_high = jd, speed
+                if side == -1:
+                    speed_low /= 2.0
+                side = -1
+            else:
+                jd_low, speed_low = jd, speed
+                if side == 1:
+                    speed_high /= 2.0
+                side = 1
+        
+        return jd
+    
+    def build_station_index(self, jd_start, jd_end, planets=None):
+        """
+        Find every retrograde and direct station over a span once and share it
+        Each planet's index maps JD to True while the planet is retrograde
+        """
+        indexes = {}
+        for planet in planets or STATION_STEPS:
+            mapped = self._almanac_index(station_section(planet), jd_start, jd_end)
+            if mapped is not None:
+                indexes[planet] = mapped
+                continue
+            
+            step = STATION_STEPS[planet]
+            
+            def build_part(span_start, span_end, planet=planet, step=step):
+                n_steps = max(1, int(math.ceil((span_end - span_start) / step)))
+                jds = np.linspace(span_start, span_end, n_steps + 1).tolist()
+                speeds = [self._planet_speed(jd, planet) for jd in jds]
+                
+                stations, values = [], []
+                for i in range(n_steps):
+                    if (speeds[i] < 0) != (speeds[i + 1] < 0):
+                        stations.append(self._solve_station(planet, jds[i], jds[i + 1], speeds[i], speeds[i + 1]))
+                        values.append(speeds[i + 1] < 0)
+                
+                return TransitionIndex(span_start, span_end, stations, values, speeds[0] < 0)
+            
+            indexes[planet] = self._extend_shared_index(
+                _STATION_INDEXES, (self.ayanamsha, planet), jd_start, jd_end, build_part
+            )
+        
+        return indexes
+    
+    def get_station_index(self, planet, jd_start, jd_end):
+        """Return the almanac or shared station index for a planet if it covers the window"""
+        index = _shared_index(_STATION_INDEXES, (self.ayanamsha, planet), jd_start, jd_end)
+        if index is not None:
+            return index
+        return self._almanac_index(station_section(planet), jd_start, jd_end)
+    
+    def get_next_station(self, jd, planet):
+        """
+        Next station after jd as (station JD, becomes_retrograde)
+        Looks STATION_LOOKAHEADS[planet] days ahead, which always holds a
+        station, extending the shared index when it ends sooner
+        """
+        lookahead = STATION_LOOKAHEADS[planet]
+        index = self.get_station_index(planet, jd, jd + lookahead)
+        if index is None:
+            index = self.build_station_index(jd, jd + lookahead, [planet])[planet]
+        
+        upcoming = index.between(jd, index.jd_end)
+        if not upcoming:
+            return None
+        station_jd, becomes_retrograde = upcoming[0]
+        return station_jd, bool(becomes_retrograde)
+    
+    def get_eclipses(self, jd_start, jd_end):
+        """
+        Global eclipses between two JDs as (jd of maximum, 'solar'/'lunar',
+        swisseph eclipse type flags), from the almanac when it covers the span
+        """
+        eclipses = []
+        for kind, lunar in (('solar', False), ('lunar', True)):
+            index = self._almanac_index(f'{kind}_eclipse', jd_start, jd_end)
+            if index is not None:
+                found = index.between(jd_start, jd_end)
+            else:
+                with self.ephemeris():
+                    found = find_eclipses(jd_start, jd_end, lunar)
+            eclipses.extend((jd, kind, ecl_type) for jd, ecl_type in found)
+        
+        return sorted(eclipses)
+    
+    def days_until_station(self, jd, planet):
+        """Days from jd until the planet next turns retrograde or direct"""
+        station = self.get_next_station(jd, planet)
+        return station[0] - jd if station else None
+    
     def get_moon_sign(self, longitude):
         """Get Moon's zodiac sign"""
         sign_index = int(longitude / 30.0)
@@ -106,80 +637,220 @@ class AstroCalculator:
         
         return navatara_names[navatara_idx]
     
-    def find_nakshatra_change_time(self, date, tz='Asia/Kolkata'):
-        """Find exact time when nakshatra changes on a given date"""
-        local_tz = pytz.timezone(tz)
-        dt_start = local_tz.localize(datetime.combine(date, datetime.min.time()))
-        dt_end = dt_start + timedelta(days=1)
+    def _body_state(self, body, jd):
+        """Longitude and daily speed of one body at a single Julian Day"""
+        series = self._series_for(body, jd)
+        if series is not None:
+            return series.longitude_at(jd), series.speed_at(jd)
         
-        jd_start = self.get_julian_day(dt_start)
-        jd_end = self.get_julian_day(dt_end)
+        with self.ephemeris():
+            result = swe.calc_ut(jd, PLANET_IDS[body], swe.FLG_SIDEREAL | swe.FLG_SPEED)[0]
+        return result[0], result[3]
+    
+    def _angle_and_speed(self, kind, jd):
+        """Angle whose boundaries define a panchanga element, and its rate"""
+        moon_long, moon_speed = self._body_state('Moon', jd)
+        if kind == 'tithi':
+            sun_long, sun_speed = self._body_state('Sun', jd)
+            return (moon_long - sun_long) % 360, moon_speed - sun_speed
+        if kind == 'yoga':
+            sun_long, sun_speed = self._body_state('Sun', jd)
+            return (sun_long + moon_long) % 360, moon_speed + sun_speed
+        return moon_long, moon_speed
+    
+    def _solve_boundary(self, kind, target, jd_low, jd_high, angle, speed):
+        """
+        Newton steps on the element's angle, kept inside [jd_low, jd_high]
+        by falling back to bisection. Usually converges in 2-4 evaluations.
+        """
+        jd = jd_low + ((target - angle) % 360) / speed
         
-        # Get nakshatra at start
-        moon_long_start = self.get_moon_position(jd_start)
-        nak_start = self.get_nakshatra(moon_long_start)
+        for _ in range(BOUNDARY_MAX_ITER):
+            if not jd_low < jd < jd_high:
+                jd = (jd_low + jd_high) / 2.0
+            
+            angle, speed = self._angle_and_speed(kind, jd)
+            error = (angle - target + 180.0) % 360.0 - 180.0
+            if error < 0:
+                jd_low = jd
+            else:
+                jd_high = jd
+            
+            step = error / speed
+            jd -= step
+            if abs(step) < BOUNDARY_TOLERANCE:
+                break
         
-        # Check if nakshatra changes during the day
-        moon_long_end = self.get_moon_position(jd_end)
-        nak_end = self.get_nakshatra(moon_long_end)
+        return jd, speed
+    
+    def find_boundaries(self, kind, jd_start, jd_end):
+        """
+        Find every boundary crossing of a panchanga element between two JDs
+        kind is one of BOUNDARY_SPANS; returns (jd, new_index) tuples in order
+        """
+        if kind in ('nakshatra', 'pada'):
+            index = self.get_transition_index(jd_start, jd_end)
+            if index is not None:
+                crossings = index.between(jd_start, jd_end)
+                if kind == 'nakshatra':
+                    crossings = [(jd, value // 4) for jd, value in crossings if value % 4 == 0]
+                return crossings
+        else:
+            index = self._almanac_index(kind, jd_start, jd_end)
+            if index is not None:
+                return index.between(jd_start, jd_end)
         
-        if nak_start['index'] == nak_end['index']:
-            return None  # No change
+        return self._solve_boundaries(kind, jd_start, jd_end)
+    
+    def _boundary_index(self, kind, jd):
+        """Which segment of a panchanga element's angle jd falls in"""
+        span = BOUNDARY_SPANS[kind]
+        angle, _ = self._angle_and_speed(kind, jd)
+        return int(angle / span) % int(round(360.0 / span))
+    
+    def _solve_boundaries(self, kind, jd_start, jd_end):
+        """Root-find every boundary crossing straight from the ephemeris"""
+        span = BOUNDARY_SPANS[kind]
+        count = int(round(360.0 / span))
+        crossings = []
         
-        # Binary search for exact change time
         jd_low = jd_start
-        jd_high = jd_end
+        angle, speed = self._angle_and_speed(kind, jd_low)
         
-        while (jd_high - jd_low) > 0.0001:  # ~8.6 seconds precision
-            jd_mid = (jd_low + jd_high) / 2.0
-            moon_long_mid = self.get_moon_position(jd_mid)
-            nak_mid = self.get_nakshatra(moon_long_mid)
+        # Step a day at a time so no window holds a full cycle
+        while jd_low < jd_end:
+            jd_high = min(jd_low + 1.0, jd_end)
+            end_angle, end_speed = self._angle_and_speed(kind, jd_high)
+            
+            index = int(angle / span) % count
+            steps = (int(end_angle / span) - index) % count
+            
+            for _ in range(steps):
+                index = (index + 1) % count
+                jd, speed = self._solve_boundary(kind, index * span, jd_low, jd_high, angle, speed)
+                crossings.append((jd, index))
+                jd_low, angle = jd, index * span
             
-            if nak_mid['index'] == nak_start['index']:
-                jd_low = jd_mid
+            jd_low, angle, speed = jd_high, end_angle, end_speed
+        
+        return crossings
+    
+    def _event_name(self, kind, index):
+        """Human-readable name of the state an event starts"""
+        if kind == 'nakshatra':
+            return self.nakshatras[index]
+        if kind == 'pada':
+            return f"{self.nakshatras[index // 4]} {index % 4 + 1}"
+        if kind == 'tithi':
+            paksha = "Shukla" if index < 15 else "Krishna"
+            return f"{paksha} {self.tithi_names[index]}"
+        if kind == 'yoga':
+            return self.yoga_names[index]
+        return self.zodiac_signs[index]
+    
+    def _iter_boundary_events(self, kind, jd_start, jd_end, tz):
+        """Boundary events of one element, solved a day at a time"""
+        jd_low = jd_start
+        while jd_end is None or jd_low < jd_end:
+            jd_high = jd_low + 1.0 if jd_end is None else min(jd_low + 1.0, jd_end)
+            for jd, index in self.find_boundaries(kind, jd_low, jd_high):
+                yield AstroEvent(jd, self.jd_to_datetime(jd, tz), kind, index, self._event_name(kind, index))
+            jd_low = jd_high
+    
+    def _iter_hora_events(self, jd_start, jd_end, lat, lon, tz):
+        """Hora starts, one Vedic day's sequence at a time"""
+        # The Vedic day holding jd_start may have begun the previous date
+        day = self.jd_to_datetime(jd_start, tz).date() - timedelta(days=1)
+        while jd_end is None or self.get_julian_day(datetime.combine(day, datetime.min.time()), tz) < jd_end:
+            for hora in self.get_hora_sequence(day, lat, lon, tz) or []:
+                if jd_end is not None and hora['start_jd'] >= jd_end:
+                    return
+                if hora['start_jd'] >= jd_start:
+                    index = self.hora_lords.index(hora['lord'])
+                    yield AstroEvent(hora['start_jd'], hora['start'], 'hora', index, hora['lord'])
+            day += timedelta(days=1)
+    
+    def iter_events(self, start, end=None, kinds=None, lat=None, lon=None, tz='Asia/Kolkata'):
+        """
+        Lazily yield AstroEvents between two datetimes (or JDs) in time order
+        Each kind is its own iterator and they are merged on the fly, so a
+        consumer only pays for the window it reads. end=None never stops.
+        Hora events need lat/lon and are skipped without them.
+        """
+        to_jd = lambda value: float(value) if isinstance(value, Real) else self.get_julian_day(value, tz)
+        jd_start = to_jd(start)
+        jd_end = None if end is None else to_jd(end)
+        
+        sources = []
+        for kind in kinds or EVENT_KINDS:
+            if kind == 'hora':
+                if lat is not None and lon is not None:
+                    sources.append(self._iter_hora_events(jd_start, jd_end, lat, lon, tz))
             else:
-                jd_high = jd_mid
+                sources.append(self._iter_boundary_events(kind, jd_start, jd_end, tz))
         
-        # Convert JD to datetime
-        change_jd = jd_high
-        year, month, day, hour = swe.revjul(change_jd)
+        return heapq.merge(*sources, key=lambda event: event.jd)
+    
+    def jd_to_datetime(self, jd, tz='Asia/Kolkata'):
+        """Convert Julian Day to a local datetime, truncated to the minute"""
+        year, month, day, hour = swe.revjul(jd)
         
-        change_dt_utc = datetime(year, month, day, int(hour), int((hour % 1) * 60))
-        change_dt_utc = pytz.UTC.localize(change_dt_utc)
-        change_dt_local = change_dt_utc.astimezone(local_tz)
+        dt_utc = datetime(year, month, day, int(hour), int((hour % 1) * 60))
+        dt_utc = pytz.UTC.localize(dt_utc)
+        return dt_utc.astimezone(pytz.timezone(tz))
+    
+    def find_change_times(self, kind, date, tz='Asia/Kolkata'):
+        """
+        Find every time a panchanga element ends on a given local date
+        Returns (local datetime, new_index) tuples; a day can hold two
+        """
+        jd_start, jd_end = julian_days([date, date + timedelta(days=1)], datetime.min.time(), tz).tolist()
         
-        return change_dt_local
+        return [
+            (self.jd_to_datetime(jd, tz), index)
+            for jd, index in self.find_boundaries(kind, jd_start, jd_end)
+        ]
+    
+    def find_nakshatra_change_times(self, date, tz='Asia/Kolkata'):
+        """Find every time the nakshatra changes on a given date"""
+        return [dt for dt, _ in self.find_change_times('nakshatra', date, tz)]
+    
+    def find_nakshatra_change_time(self, date, tz='Asia/Kolkata'):
+        """Find exact time when nakshatra changes on a given date"""
+        change_times = self.find_nakshatra_change_times(date, tz)
+        return change_times[0] if change_times else None
     
     def is_change_during_market_hours(self, change_time):
-        """Check if nakshatra change occurs during NSE market hours"""
+        """
+        Check if nakshatra change occurs during NSE market hours
+        Accepts a change time, or a date whose changes are looked up
+        """
         if change_time is None:
             return False
         
+        if not isinstance(change_time, datetime):
+            return any(
+                self.is_change_during_market_hours(t)
+                for t in self.find_nakshatra_change_times(change_time)
+            )
+        
         market_start = change_time.replace(hour=9, minute=15, second=0)
         market_end = change_time.replace(hour=15, minute=30, second=0)
         
         return market_start <= change_time <= market_end
     
     def get_tithi(self, jd):
-        """Calculate Tithi (Lunar day)"""
-        sun_long = self.get_planet_position(jd, 'Sun')
-        moon_long = self.get_moon_position(jd)
+        """Calculate Tithi (Lunar day) from a Julian Day or a SkySnapshot"""
+        sky = self._as_snapshot(jd)
+        sun_long = sky.longitudes['Sun']
+        moon_long = sky.longitudes['Moon']
         
         # Tithi calculation
         diff = (moon_long - sun_long) % 360
         tithi_num = int(diff / 12.0) + 1
         
-        tithi_names = [
-            "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
-            "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
-            "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima",
-            "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
-            "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
-            "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"
-        ]
-        
         paksha = "Shukla" if tithi_num <= 15 else "Krishna"
-        tithi_name = tithi_names[tithi_num - 1]
+        tithi_name = self.tithi_names[tithi_num - 1]
         
         return {
             'number': tithi_num,
@@ -188,31 +859,125 @@ class AstroCalculator:
         }
     
     def get_yoga(self, jd):
-        """Calculate Yoga"""
-        sun_long = self.get_planet_position(jd, 'Sun')
-        moon_long = self.get_moon_position(jd)
+        """Calculate Yoga from a Julian Day or a SkySnapshot"""
+        return self.yoga_names[self.get_yoga_index(jd)]
+    
+    def get_yoga_index(self, jd):
+        """Yoga index (0-26) from a Julian Day or a SkySnapshot"""
+        sky = self._as_snapshot(jd)
+        sun_long = sky.longitudes['Sun']
+        moon_long = sky.longitudes['Moon']
         
         yoga_value = (sun_long + moon_long) % 360
-        yoga_num = int(yoga_value / (360.0 / 27.0))
+        return int(yoga_value / (360.0 / 27.0))
+    
+    def fill_sun_times(self, start_date, end_date, lat, lon, tz='Asia/Kolkata'):
+        """
+        Bulk-fill the sunrise/sunset cache for a location over a date range
+        Cached per rounded (lat, lon, date), so nearby profiles share entries
+        """
+        days = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        midnights = julian_days(days, datetime.min.time(), tz).tolist()
         
-        yoga_names = [
-            "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana",
-            "Atiganda", "Sukarma", "Dhriti", "Shoola", "Ganda",
-            "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
-            "Siddhi", "Vyatipata", "Variyan", "Parigha", "Shiva",
-            "Siddha", "Sadhya", "Shubha", "Shukla", "Brahma",
-            "Indra", "Vaidhriti"
+        for day, jd_midnight in zip(days, midnights):
+            key = (round(lat, SUN_TIMES_PRECISION), round(lon, SUN_TIMES_PRECISION), day)
+            cached(_SUN_TIMES, SUN_TIMES_CACHE_SIZE, key, lambda: self._sun_times(jd_midnight, lat, lon))
+    
+    def _sun_times(self, jd_midnight, lat, lon):
+        """Sunrise and sunset after a local midnight JD, or None if polar"""
+        geopos = (lon, lat, 0.0)
+        with self.ephemeris():
+            res, rise = swe.rise_trans(jd_midnight, swe.SUN, swe.CALC_RISE, geopos)
+            if res == 0:
+                res, sset = swe.rise_trans(rise[0], swe.SUN, swe.CALC_SET, geopos)
+        
+        # Polar day or night has no sunrise to count horas from
+        return (rise[0], sset[0]) if res == 0 else None
+    
+    def get_sun_times(self, day, lat, lon, tz='Asia/Kolkata'):
+        """Sunrise and sunset Julian Days on a local date, or None if polar"""
+        key = (round(lat, SUN_TIMES_PRECISION), round(lon, SUN_TIMES_PRECISION), day)
+        return cached(
+            _SUN_TIMES, SUN_TIMES_CACHE_SIZE, key,
+            lambda: self._sun_times(float(julian_days([day], datetime.min.time(), tz)[0]), lat, lon)
+        )
+    
+    def _hora_bounds(self, day, lat, lon, tz='Asia/Kolkata'):
+        """
+        The 25 hora boundary JDs of a Vedic day, sunrise to next sunrise
+        12 equal day horas until sunset, then 12 equal night horas
+        Returns None when the Sun does not rise or set at the location
+        """
+        today = self.get_sun_times(day, lat, lon, tz)
+        tomorrow = self.get_sun_times(day + timedelta(days=1), lat, lon, tz)
+        if today is None or tomorrow is None:
+            return None
+        
+        sunrise, sunset = today
+        next_sunrise = tomorrow[0]
+        day_hora = (sunset - sunrise) / 12.0
+        night_hora = (next_sunrise - sunset) / 12.0
+        return [sunrise + day_hora * i for i in range(12)] + \
+               [sunset + night_hora * i for i in range(12)] + [next_sunrise]
+    
+    def get_hora_sequence(self, day, lat, lon, tz='Asia/Kolkata'):
+        """
+        All 24 horas of a Vedic day, sunrise to next sunrise
+        Returns None when the Sun does not rise or set at the location
+        """
+        bounds = self._hora_bounds(day, lat, lon, tz)
+        if bounds is None:
+            return None
+        
+        first_lord_idx = self.hora_lords.index(DAY_LORDS[day.weekday()])
+        return [
+            {
+                'number': i + 1,
+                'start': self.jd_to_datetime(bounds[i], tz),
+                'end': self.jd_to_datetime(bounds[i + 1], tz),
+                'start_jd': bounds[i],
+                'end_jd': bounds[i + 1],
+                'lord': self.hora_lords[(first_lord_idx + i) % 7]
+            }
+            for i in range(24)
         ]
+    
+    def get_hora(self, dt, lat=None, lon=None, tz='Asia/Kolkata'):
+        """
+        Calculate Hora (Planetary hour) from true sunrise and sunset
+        Falls back to a fixed 6 AM sunrise when no location is given
+        """
+        if lat is None or lon is None:
+            return self._get_hora_fixed(dt)
+        
+        jd = self.get_julian_day(dt, tz)
+        
+        # The Vedic day runs from sunrise, so early hours belong to yesterday
+        day = dt.date()
+        sun_times = self.get_sun_times(day, lat, lon, tz)
+        if sun_times is not None and jd < sun_times[0]:
+            day -= timedelta(days=1)
         
-        return yoga_names[yoga_num]
+        # Only the boundary JDs are needed, not the full sequence's datetimes
+        bounds = self._hora_bounds(day, lat, lon, tz)
+        if bounds is None:
+            return self._get_hora_fixed(dt)
+        
+        number = min(max(bisect_right(bounds, jd) - 1, 0), 23)
+        first_lord_idx = self.hora_lords.index(DAY_LORDS[day.weekday()])
+        
+        return {
+            'lord': self.hora_lords[(first_lord_idx + number) % 7],
+            'day_lord': DAY_LORDS[day.weekday()]
+        }
     
-    def get_hora(self, dt):
-        """Calculate Hora (Planetary hour)"""
+    def _get_hora_fixed(self, dt):
+        """Hora with sunrise fixed at 6 AM, used when no location is known"""
         # Get weekday (0=Monday, 6=Sunday)
         weekday = dt.weekday()
         
         # Day lords
-        day_lords = ["Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Sun"]
+        day_lords = DAY_LORDS
         day_lord = day_lords[weekday]
         
         # Calculate hora from sunrise
@@ -237,47 +1002,103 @@ class AstroCalculator:
             'day_lord': day_lord
         }
     
+    def _sidereal_constants(self, jd):
+        """Greenwich sidereal time (hours), true obliquity and ayanamsha at jd"""
+        def compute():
+            with self.ephemeris():
+                return (
+                    swe.sidtime(jd),
+                    swe.calc_ut(jd, swe.ECL_NUT)[0][0],
+                    swe.get_ayanamsa_ut(jd)
+                )
+        
+        return cached(_SIDEREAL_CONSTANTS, SIDEREAL_CACHE_SIZE, (self.ayanamsha, round(jd, 6)), compute)
+    
+    def _ascendants(self, jds, jd_ref, lat, lon):
+        """
+        Sidereal ascendant longitudes near jd_ref
+        Sidereal time is advanced linearly from jd_ref instead of calling
+        swe.houses per instant; within a day this agrees to ~1e-5 degrees
+        """
+        gst, obliquity, ayanamsha = self._sidereal_constants(jd_ref)
+        ramc = np.radians((gst * 15.0 + (jds - jd_ref) * SIDEREAL_DAY_RATIO * 360.0 + lon) % 360.0)
+        eps = math.radians(obliquity)
+        
+        asc = np.degrees(np.arctan2(
+            np.cos(ramc),
+            -(np.sin(ramc) * math.cos(eps) + math.tan(math.radians(lat)) * math.sin(eps))
+        ))
+        return (asc - ayanamsha) % 360.0
+    
+    def get_lagna_timeline(self, day, lat, lon, start='09:15', end='15:30', tz='Asia/Kolkata'):
+        """
+        Rising signs across a session for a location, with exact change times
+        Returns one dict per sign in order, defaulting to NSE market hours
+        """
+        jd_start = float(julian_days([day], datetime.strptime(start, '%H:%M').time(), tz)[0])
+        jd_end = float(julian_days([day], datetime.strptime(end, '%H:%M').time(), tz)[0])
+        
+        # Minute grid first, then bisect each minute that holds a change
+        n_minutes = max(1, int(math.ceil((jd_end - jd_start) * 1440)))
+        grid = np.linspace(jd_start, jd_end, n_minutes + 1)
+        signs = (self._ascendants(grid, jd_start, lat, lon) // 30).astype(int)
+        changes = np.nonzero(signs[1:] != signs[:-1])[0]
+        
+        bounds = [jd_start]
+        for i in changes:
+            jd_low, jd_high = grid[i], grid[i + 1]
+            while jd_high - jd_low > BOUNDARY_TOLERANCE:
+                jd_mid = (jd_low + jd_high) / 2.0
+                if int(self._ascendants(jd_mid, jd_start, lat, lon) // 30) == signs[i]:
+                    jd_low = jd_mid
+                else:
+                    jd_high = jd_mid
+            bounds.append(float(jd_high))
+        bounds.append(jd_end)
+        
+        sign_indexes = [int(signs[0])] + [int(signs[i + 1]) for i in changes]
+        return [
+            {
+                'sign': self.zodiac_signs[sign_index],
+                'sign_index': sign_index,
+                'start': self.jd_to_datetime(bounds[i], tz),
+                'end': self.jd_to_datetime(bounds[i + 1], tz),
+                'start_jd': bounds[i],
+                'end_jd': bounds[i + 1]
+            }
+            for i, sign_index in enumerate(sign_indexes)
+        ]
+    
     def get_moon_phase(self, jd):
-        """Calculate Moon phase"""
-        sun_long = self.get_planet_position(jd, 'Sun')
-        moon_long = self.get_moon_position(jd)
+        """Calculate Moon phase from a Julian Day or a SkySnapshot"""
+        return MOON_PHASES[self.get_moon_phase_index(jd)]
+    
+    def get_moon_phase_index(self, jd):
+        """Index into MOON_PHASES from a Julian Day or a SkySnapshot"""
+        sky = self._as_snapshot(jd)
+        sun_long = sky.longitudes['Sun']
+        moon_long = sky.longitudes['Moon']
         
         phase_angle = (moon_long - sun_long) % 360
         
-        if phase_angle < 45:
-            return "New Moon"
-        elif phase_angle < 90:
-            return "Waxing Crescent"
-        elif phase_angle < 135:
-            return "First Quarter"
-        elif phase_angle < 180:
-            return "Waxing Gibbous"
-        elif phase_angle < 225:
-            return "Full Moon"
-        elif phase_angle < 270:
-            return "Waning Gibbous"
-        elif phase_angle < 315:
-            return "Last Quarter"
-        else:
-            return "Waning Crescent"
+        return min(int(phase_angle // 45), 7)
     
     def is_planet_retrograde(self, jd, planet):
-        """Check if planet is retrograde"""
-        planet_ids = {
-            'Mercury': swe.MERCURY,
-            'Venus': swe.VENUS,
-            'Mars': swe.MARS,
-            'Jupiter': swe.JUPITER,
-            'Saturn': swe.SATURN
-        }
+        """Check if planet is retrograde at a Julian Day or a SkySnapshot"""
+        if isinstance(jd, SkySnapshot):
+            if planet in jd.speeds:
+                return jd.speeds[planet] < 0
+            jd = jd.jd
         
-        if planet not in planet_ids:
+        if planet not in STATION_STEPS:
             return False
         
-        result = swe.calc_ut(jd, planet_ids[planet], swe.FLG_SIDEREAL | swe.FLG_SPEED)
-        speed = result[0][3]  # Daily motion in longitude
+        # Interval lookup when the station index covers jd
+        index = self.get_station_index(planet, jd, jd)
+        if index is not None:
+            return bool(index.value_at(jd))
         
-        return speed < 0
+        return self._planet_speed(jd, planet) < 0  # Daily motion in longitude
     
     def calculate_ashtama(self, current_sign_idx, reference_sign_idx):
         """Calculate if Moon is in 8th house from reference"""
@@ -285,34 +1106,17 @@ class AstroCalculator:
         return diff == 7  # 8th house (0-indexed becomes 7)
 
 
-def calculate_lagna(date_obj, time_obj, lat, lon):
-    """
-    Calculate Lagna (Ascendant) for given birth details
-    Assumes input time is in IST (Indian Standard Time)
-    Converts to UTC for accurate calculation
-    """
-    import swisseph as swe
-    from datetime import datetime, timedelta
-    
-    # Convert IST to UTC (IST = UTC + 5:30)
-    ist_dt = datetime.combine(date_obj, time_obj)
-    utc_dt = ist_dt - timedelta(hours=5, minutes=30)
-    
-    # Calculate Julian day in UTC
-    jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, 
-                    utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
-    
-    # Set Lahiri ayanamsa (sidereal zodiac standard in India)
-    swe.set_sid_mode(swe.SIDM_LAHIRI)
-    
-    # Calculate houses using Placidus system
-    cusps, ascmc = swe.houses(jd, lat, lon, b'P')
-    
-    # Get ascendant degree (tropical)
-    asc_degree_tropical = ascmc[0]
-    
-    # Apply ayanamsa to get sidereal ascendant
-    ayanamsa = swe.get_ayanamsa(jd)
+def _lagna_sign(jd, lat, lon, ayanamsha='LAHIRI'):
+    """Sidereal rising sign at a UT Julian Day and place"""
+    with ephemeris_context(ayanamsha):
+        # Calculate houses using Placidus system
+        cusps, ascmc = swe.houses(jd, lat, lon, b'P')
+        
+        # Get ascendant degree (tropical)
+        asc_degree_tropical = ascmc[0]
+        
+        # Apply ayanamsa to get sidereal ascendant
+        ayanamsa = swe.get_ayanamsa(jd)
     sidereal_asc = (asc_degree_tropical - ayanamsa) % 360
     
     # Convert degree to zodiac sign
@@ -321,3 +1125,40 @@ def calculate_lagna(date_obj, time_obj, lat, lon):
     
     sign_index = int(sidereal_asc / 30)
     return signs[sign_index]
+
+
+def _shared_index(cache, key, jd_start, jd_end):
+    """Shared TransitionIndex under a key that covers a window, or None"""
+    for index in cache.get(key, []):
+        if index.covers(jd_start, jd_end):
+            return index
+    return None
+
+
+@lru_cache(maxsize=NATAL_CACHE_SIZE)
+def _natal_chart(dob, tob, lat, lon, ayanamsha, tz):
+    """Memoized NatalChart construction on normalized birth data"""
+    return NatalChart(dob, tob, lat, lon, ayanamsha, tz)
+
+
+def get_natal_chart(dob, tob, lat=None, lon=None, ayanamsha='LAHIRI', tz='Asia/Kolkata'):
+    """
+    Shared NatalChart for birth data, from a bounded LRU cache
+    dob is a date or ISO string, tob a time or 'HH:MM' string
+    """
+    if isinstance(dob, str):
+        dob = datetime.fromisoformat(dob)
+    if isinstance(dob, datetime):
+        dob = dob.date()
+    if isinstance(tob, str):
+        tob = datetime.strptime(tob, '%H:%M').time()
+    return _natal_chart(dob, tob, lat, lon, ayanamsha, tz)
+
+
+def calculate_lagna(date_obj, time_obj, lat, lon, tz='Asia/Kolkata'):
+    """
+    Calculate Lagna (Ascendant) for given birth details
+    Input time is local wall-clock time in tz, converted with the zone's
+    historical offsets (e.g. IST+1 war time in 1942-45)
+    """
+    return get_natal_chart(date_obj, time_obj, lat, lon, 'LAHIRI', tz).lagna
@@ -0,0 +1,32 @@
+"""
+Bounded process-wide caches shared across threads
+"""
+import threading
+
+# One lock for every bounded cache; lookups and evictions are short, and
+# values are built outside it
+_cache_lock = threading.RLock()
+
+
+def store(cache, size, key, value):
+    """
+    Insert into a dict holding at most size entries, evicting oldest first
+    Returns value, so callers never read it back after a concurrent eviction
+    """
+    with _cache_lock:
+        cache.pop(key, None)
+        while len(cache) >= size:
+            del cache[next(iter(cache))]
+        cache[key] = value
+    return value
+
+
+def cached(cache, size, key, build):
+    """
+    Look up a bounded cache, calling build() and storing its result on a miss
+    Two threads missing the same key may both build it; the last one is kept
+    """
+    with _cache_lock:
+        if key in cache:
+            return cache[key]
+    return store(cache, size, key, build())
@@ -0,0 +1,133 @@
+"""
+Ownership of the process-global Swiss Ephemeris state
+"""
+import os
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import swisseph as swe
+
+SIDEREAL_MODES = {
+    'LAHIRI': swe.SIDM_LAHIRI,
+    'RAMAN': swe.SIDM_RAMAN,
+    'KP': swe.SIDM_KRISHNAMURTI,
+    'YUKTESHWAR': swe.SIDM_YUKTESHWAR,
+    'TRUE_CHITRA': swe.SIDM_TRUE_CITRA,
+    'FAGAN_BRADLEY': swe.SIDM_FAGAN_BRADLEY
+}
+
+DEFAULT_EPHE_PATH = ''  # Use built-in ephemeris
+
+# Workers are spawned, not forked: a fork taken while another thread holds
+# _EPHE_LOCK would leave the child's copy of the lock held forever
+WORKER_START_METHOD = 'spawn'
+
+# Workers in the shared pool; each loads pandas and swisseph, so a server
+# keeps few of them unless configured otherwise
+SHARED_EXECUTOR_WORKERS = 2
+
+# swisseph keeps one ephemeris path and one sidereal mode per process, so
+# every call that depends on them runs under this lock
+_EPHE_LOCK = threading.RLock()
+_state = {'ephe_path': None, 'sid_mode': None}
+
+
+def _configure(ayanamsha, ephe_path):
+    """Apply settings to swisseph, skipping calls that would change nothing"""
+    if ayanamsha not in SIDEREAL_MODES:
+        raise ValueError(f"Unsupported ayanamsha: {ayanamsha}")
+
+    if _state['ephe_path'] != ephe_path:
+        swe.set_ephe_path(ephe_path)
+        _state['ephe_path'] = ephe_path
+
+    sid_mode = SIDEREAL_MODES[ayanamsha]
+    if _state['sid_mode'] != sid_mode:
+        swe.set_sid_mode(sid_mode)
+        _state['sid_mode'] = sid_mode
+
+
+@contextmanager
+def ephemeris_context(ayanamsha='LAHIRI', ephe_path=DEFAULT_EPHE_PATH):
+    """Hold the ephemeris lock with the given settings applied"""
+    with _EPHE_LOCK:
+        _configure(ayanamsha, ephe_path)
+        yield
+
+
+def _init_worker(ayanamsha, ephe_path):
+    """Configure a worker process's own copy of the swisseph state"""
+    _configure(ayanamsha, ephe_path)
+
+
+class EphemerisExecutor:
+    """
+    Process pool where every worker owns a configured Swiss Ephemeris
+
+    Each worker process has private swisseph globals, so calendars submitted
+    from concurrent sessions run in parallel without racing on settings or
+    queueing behind the GIL. Workers are spawned, so a script creating the
+    pool must guard its entry point with if __name__ == '__main__'.
+    """
+
+    def __init__(self, max_workers=None, ayanamsha='LAHIRI', ephe_path=DEFAULT_EPHE_PATH):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+            initializer=_init_worker,
+            initargs=(ayanamsha, ephe_path)
+        )
+        # Set once a worker has died; a broken pool fails every later job
+        self.broken = False
+
+    def submit(self, fn, *args, **kwargs):
+        """Run a picklable function in a worker, returning a Future"""
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            self.broken = True
+            raise
+        future.add_done_callback(self._check_broken)
+        return future
+
+    def _check_broken(self, future):
+        """Mark the pool broken when a job failed because its worker died"""
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self.broken = True
+
+    def map(self, fn, *iterables, chunksize=1):
+        """Map a picklable function over the workers, preserving order"""
+        return self._pool.map(fn, *iterables, chunksize=chunksize)
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes"""
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+_shared_executor = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_executor(max_workers=SHARED_EXECUTOR_WORKERS):
+    """
+    Process-wide executor shared by every session
+    max_workers applies when the pool is (re)built. A pool broken by a
+    crashed worker is replaced, so one crash does not fail later requests
+    """
+    global _shared_executor
+    with _shared_lock:
+        if _shared_executor is not None and _shared_executor.broken:
+            _shared_executor.shutdown(wait=False)
+            _shared_executor = None
+        if _shared_executor is None:
+            _shared_executor = EphemerisExecutor(max_workers or SHARED_EXECUTOR_WORKERS)
+        return _shared_executor
@@ -0,0 +1,128 @@
+"""
+Exchange holiday calendars, loaded once per process
+"""
+import os
+import warnings
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Holiday file for each exchange
+EXCHANGE_HOLIDAY_FILES = {
+    'NSE': 'data/nse_holidays.csv',
+    'BSE': 'data/bse_holidays.csv'
+}
+
+DEFAULT_EXCHANGE = 'NSE'
+
+# numpy day numbers start on 1970-01-01, a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+class HolidayCalendar:
+    """
+    Holidays and special sessions of one exchange
+
+    The CSV has 'date' and 'description' columns. Rows that also give
+    'session_start' and 'session_end' (HH:MM) are special sessions such as
+    Muhurat trading rather than closures; a Diwali date usually has both.
+    """
+
+    def __init__(self, exchange, path):
+        self.exchange = exchange
+        self.path = path
+        self.holidays = {}
+        self.sessions = {}
+
+        if not os.path.exists(path):
+            warnings.warn(f"Holiday file {path} not found; {exchange} will have no holidays")
+        else:
+            self._load(path)
+
+        self._holiday_days = np.array(sorted(self.holidays), dtype='datetime64[D]')
+        self._session_days = np.array(sorted(self.sessions), dtype='datetime64[D]')
+
+    def _load(self, path):
+        """Read holidays and special sessions from a CSV file"""
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        missing = {'date', 'description'} - set(df.columns)
+        if missing:
+            raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+
+        has_sessions = 'session_start' in df.columns and 'session_end' in df.columns
+        for row in df.to_dict('records'):
+            day = pd.to_datetime(row['date']).date()
+            if has_sessions and row['session_start']:
+                self.sessions[day] = (
+                    row['description'],
+                    datetime.strptime(row['session_start'], '%H:%M').time(),
+                    datetime.strptime(row['session_end'], '%H:%M').time()
+                )
+            else:
+                self.holidays[day] = row['description']
+
+    def __contains__(self, day):
+        return day in self.holidays
+
+    def name(self, day):
+        """Holiday name on a date, or '' if the exchange is open"""
+        return self.holidays.get(day, '')
+
+    def special_session(self, day):
+        """(name, start, end) of a special session on a date, or None"""
+        return self.sessions.get(day)
+
+    def label(self, day):
+        """
+        Calendar label of a date: a special session with its hours, e.g.
+        'Muhurat Trading 18:15-19:15', else the holiday name or ''
+        """
+        session = self.sessions.get(day)
+        if session is not None:
+            name, start, end = session
+            return f"{name} {start.strftime('%H:%M')}-{end.strftime('%H:%M')}"
+        return self.name(day)
+
+    def is_holiday(self, dates):
+        """Boolean mask of holidays over an array of dates"""
+        return np.isin(np.asarray(dates, dtype='datetime64[D]'), self._holiday_days)
+
+    def is_special_session(self, dates):
+        """Boolean mask of special-session days over an array of dates"""
+        return np.isin(np.asarray(dates, dtype='datetime64[D]'), self._session_days)
+
+    def is_weekend(self, dates):
+        """Boolean mask of Saturdays and Sundays over an array of dates"""
+        days = np.asarray(dates, dtype='datetime64[D]')
+        return (days.astype(np.int64) + _EPOCH_WEEKDAY) % 7 >= 5
+
+    def is_trading_day(self, dates, special_sessions=True):
+        """
+        Boolean mask of dates the exchange trades on
+        Weekdays that are not holidays, plus special-session days unless
+        special_sessions is False
+        """
+        days = np.asarray(dates, dtype='datetime64[D]')
+        trading = ~self.is_weekend(days) & ~np.isin(days, self._holiday_days)
+        if special_sessions:
+            trading |= np.isin(days, self._session_days)
+        return trading
+
+
+_CALENDARS = {}
+
+
+def get_holiday_calendar(exchange=DEFAULT_EXCHANGE, path=None):
+    """
+    Shared HolidayCalendar for an exchange
+    path overrides the exchange's default file
+    """
+    if path is None:
+        if exchange not in EXCHANGE_HOLIDAY_FILES:
+            raise ValueError(f"Unknown exchange: {exchange}")
+        path = EXCHANGE_HOLIDAY_FILES[exchange]
+
+    key = (exchange, path)
+    if key not in _CALENDARS:
+        _CALENDARS[key] = HolidayCalendar(exchange, path)
+    return _CALENDARS[key]
@@ -1,6 +1,7 @@
 """
 Report Generator for Excel, PDF outputs
 """
+import csv
 import pandas as pd
 from datetime import datetime
 from openpyxl import Workbook
@@ -8,6 +9,7 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 import matplotlib.pyplot as plt
 import io
+from .statistics import CalendarStatistics
 
 class ReportGenerator:
     def __init__(self):
@@ -105,25 +107,22 @@ class ReportGenerator:
         # Add summary sheet
         ws_summary = wb.create_sheet("Summary")
         
-        # Summary statistics
-        total = len(df)
-        trade_days = len(df[df['recommendation'] == 'TRADE'])
-        light_days = len(df[df['recommendation'] == 'LIGHT'])
-        avoid_days = len(df[df['recommendation'] == 'AVOID'])
-        closed_days = len(df[df['recommendation'] == 'CLOSED'])
+        # Summary statistics, counted in one pass
+        stats = CalendarStatistics(df)
+        summary = stats.summary()
         
         summary_data = [
             ['Summary Statistics', ''],
-            ['Total Days', total],
-            ['Trade Days', trade_days],
-            ['Light Days', light_days],
-            ['Avoid Days', avoid_days],
-            ['Closed Days', closed_days],
+            ['Total Days', summary['total_days']],
+            ['Trade Days', summary['trade_days']],
+            ['Light Days', summary['light_days']],
+            ['Avoid Days', summary['avoid_days']],
+            ['Closed Days', summary['closed_days']],
             ['', ''],
             ['Percentages', ''],
-            ['Trade %', f"{(trade_days/total*100):.1f}%"],
-            ['Light %', f"{(light_days/total*100):.1f}%"],
-            ['Avoid %', f"{(avoid_days/total*100):.1f}%"],
+            ['Trade %', f"{stats.percentage('TRADE'):.1f}%"],
+            ['Light %', f"{stats.percentage('LIGHT'):.1f}%"],
+            ['Avoid %', f"{stats.percentage('AVOID'):.1f}%"],
         ]
         
         for row_idx, row_data in enumerate(summary_data, start=1):
@@ -147,10 +146,25 @@ class ReportGenerator:
             'recommendation', 'reasons', 'tithi', 'yoga', 'moon_phase'
         ]].copy()
         
-        export_df['date'] = export_df['date'].dt.strftime('%Y-%m-%d')
+        export_df['date'] = pd.to_datetime(export_df['date']).dt.strftime('%Y-%m-%d')
         export_df.to_csv(output_path, index=False)
         return output_path
     
+    def stream_csv(self, days, output_path):
+        """
+        Write calendar days to CSV as they arrive, e.g. from iter_calendar
+        Same columns as generate_csv; memory use does not grow with the range
+        """
+        columns = ['date', 'weekday', 'nakshatra', 'navatara', 'change_time',
+                   'recommendation', 'reasons', 'tithi', 'yoga', 'moon_phase']
+        
+        with open(output_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for day in days:
+                writer.writerow([day['date'].strftime('%Y-%m-%d')] + [day[c] for c in columns[1:]])
+        return output_path
+    
 
     def create_excel_report(self, df, profile_name):
         """Wrapper method for compatibility with app.py"""
@@ -0,0 +1,235 @@
+"""
+Trading rules compiled from config.json into vectorized predicates
+"""
+import os
+import json
+import re
+import threading
+import warnings
+from string import Formatter
+import numpy as np
+import pandas as pd
+
+# Rules used when config.json gives no 'rules' list; the order is the
+# precedence, and the first rule matching a day decides it
+DEFAULT_RULES = [
+    {'when': 'is_holiday', 'then': 'CLOSED', 'reason': 'Market Holiday'},
+    {'when': 'is_weekend', 'then': 'CLOSED', 'reason': 'Weekend'},
+    {'when': 'navatara', 'in': 'avoid', 'then': 'AVOID', 'reason': 'Navatara: {navatara}'},
+    {'when': 'ashtama_moon', 'then': 'AVOID', 'reason': 'Moon in 8th from natal Moon'},
+    {'when': 'navatara', 'in': 'light', 'then': 'LIGHT', 'reason': 'Navatara: {navatara}'},
+    {'when': 'ashtama_lagna', 'then': 'LIGHT', 'reason': 'Moon in 8th from Lagna'},
+    {'when': 'change_during_market', 'then': 'LIGHT', 'reason': 'Nakshatra changes during market hours'},
+    {'when': 'moon_phase', 'in': ['Full Moon', 'New Moon'], 'then': 'LIGHT', 'reason': '{moon_phase}'},
+    {'when': 'retrogrades', 'in': ['Mercury'], 'then': 'LIGHT', 'reason': 'Mercury Retrograde'}
+]
+
+DEFAULT_OUTCOME = {'then': 'TRADE', 'reason': 'Favorable Navatara: {navatara}'}
+
+# Navatara lists used by the default rules when the config has none
+DEFAULT_NAVATARA_LISTS = {
+    'avoid': ['Vipat', 'Pratyari', 'Naidhana'],
+    'light': ['Janma', 'Kshema']
+}
+
+# Columns a rule can test
+RULE_COLUMNS = [
+    'is_holiday', 'is_weekend', 'navatara', 'ashtama_moon', 'ashtama_lagna',
+    'change_during_market', 'moon_phase', 'retrogrades', 'nakshatra',
+    'moon_sign', 'tithi', 'yoga', 'weekday'
+]
+
+# Yes/no columns, the only ones a rule may test without 'in'
+FLAG_COLUMNS = [
+    'is_holiday', 'is_weekend', 'ashtama_moon', 'ashtama_lagna', 'change_during_market'
+]
+
+# Columns holding a ', '-joined list, where 'in' matches any member
+LIST_COLUMNS = ['retrogrades']
+
+
+class RuleSet:
+    """
+    Ordered trading rules compiled from a trading_rules config section
+
+    Each rule is {'when': column, 'then': recommendation, 'reason': text}.
+    Without 'in' the column must be one of FLAG_COLUMNS; with 'in' it must be one of
+    the listed values, or the name of a list in the same section such as
+    'avoid'. Reasons may name columns in braces, e.g. 'Navatara: {navatara}'.
+    """
+
+    def __init__(self, trading_rules):
+        trading_rules = trading_rules or {}
+        lists = dict(DEFAULT_NAVATARA_LISTS)
+        lists.update({k: v for k, v in trading_rules.items() if isinstance(v, list) and k != 'rules'})
+
+        # Canonical spec, used as a cache key for results of these rules
+        spec = {
+            'lists': lists,
+            'rules': trading_rules.get('rules', DEFAULT_RULES),
+            'default': trading_rules.get('default', DEFAULT_OUTCOME)
+        }
+        self.key = json.dumps(spec, sort_keys=True)
+        self.rules = [self._compile(rule, lists) for rule in spec['rules']]
+        self.default = (spec['default']['then'], _compile_template(spec['default']['reason']))
+        
+        # Every recommendation these rules can give, in rule order
+        self.outcomes = list(dict.fromkeys([then for _, then, _ in self.rules] + [self.default[0]]))
+
+    @staticmethod
+    def _compile(rule, lists):
+        """Turn one rule dict into (predicate, recommendation, reason template)"""
+        column = rule.get('when')
+        if column not in RULE_COLUMNS:
+            raise ValueError(f"Rule tests unknown column {column!r}; expected one of {RULE_COLUMNS}")
+        if 'then' not in rule:
+            raise ValueError(f"Rule on {column!r} has no 'then' recommendation")
+
+        values = rule.get('in')
+        if isinstance(values, str):
+            if values not in lists:
+                raise ValueError(f"Rule on {column!r} refers to unknown list {values!r}")
+            values = lists[values]
+        if values is None and column not in FLAG_COLUMNS:
+            raise ValueError(
+                f"Rule on {column!r} has no 'in' list; only {FLAG_COLUMNS} can be tested as flags"
+            )
+
+        if values is None:
+            predicate = lambda columns: np.asarray(columns[column], dtype=bool)
+        elif column in LIST_COLUMNS:
+            pattern = re.compile(r'(?:^|, )(?:' + '|'.join(re.escape(v) for v in values) + r')(?:,|$)')
+            predicate = lambda columns: _per_value(columns[column], lambda v: bool(pattern.search(v)))
+        else:
+            predicate = lambda columns: _isin(columns[column], values)
+
+        return predicate, rule['then'], _compile_template(rule.get('reason', ''))
+
+    def evaluate(self, columns):
+        """
+        Decide every day at once
+        columns maps column names to equal-length arrays (a DataFrame works).
+        Returns (recommendations, reasons) as categoricals
+        """
+        n = len(columns['navatara'])
+        if not self.rules:
+            return (
+                pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), self.outcomes),
+                self.default[1](columns, n)
+            )
+
+        conditions = [predicate(columns) for predicate, _, _ in self.rules]
+        recommendations = np.select(
+            conditions,
+            [np.full(n, self.outcomes.index(then), dtype=np.int8) for _, then, _ in self.rules],
+            default=self.outcomes.index(self.default[0])
+        )
+
+        # Each template gives a categorical; their codes are offset into
+        # one list of labels, which is then deduplicated
+        rendered = [template(columns, n) for _, _, template in self.rules] + [self.default[1](columns, n)]
+        offsets = np.cumsum([0] + [len(r.categories) for r in rendered])
+        codes = np.select(
+            conditions,
+            [r.codes + offset for r, offset in zip(rendered[:-1], offsets)],
+            default=rendered[-1].codes + offsets[-2]
+        )
+        remap, labels = pd.factorize(np.concatenate([np.asarray(r.categories, dtype=object) for r in rendered]))
+        return (
+            pd.Categorical.from_codes(recommendations, self.outcomes),
+            pd.Categorical.from_codes(remap[codes], labels).remove_unused_categories()
+        )
+
+
+def _isin(column, values):
+    """Membership mask; a categorical is tested once per category, not per row"""
+    if isinstance(getattr(column, 'dtype', None), pd.CategoricalDtype):
+        column = pd.Categorical(column)
+        return np.isin(np.asarray(column.categories, dtype=object), values)[column.codes]
+    return np.isin(np.asarray(column, dtype=object), values)
+
+
+def _per_value(column, test):
+    """
+    Mask from a Python test run once per distinct value, not per row
+    A categorical's categories are the values; other columns are factorized
+    """
+    if isinstance(getattr(column, 'dtype', None), pd.CategoricalDtype):
+        column = pd.Categorical(column)
+        values, codes = column.categories, column.codes
+    else:
+        codes, values = pd.factorize(np.asarray(column, dtype=object))
+    return np.fromiter((test(v) for v in values), dtype=bool, count=len(values))[codes]
+
+
+def _compile_template(text):
+    """
+    Reason template as a function building a categorical of reasons
+    Each distinct combination of the named columns' values is formatted
+    once, not once per row
+    """
+    parts = [(literal, field) for literal, field, _, _ in Formatter().parse(text)]
+    fields = list(dict.fromkeys(field for _, field in parts if field is not None))
+    for field in fields:
+        if field not in RULE_COLUMNS:
+            raise ValueError(f"Reason {text!r} uses unknown column {field!r}")
+
+    def render(columns, n):
+        if not fields:
+            return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [''.join(literal for literal, _ in parts)])
+
+        factorized = [_factorize(columns[field]) for field in fields]
+        combos, codes = np.unique(
+            np.stack([field_codes for field_codes, _ in factorized], axis=1), axis=0, return_inverse=True
+        )
+        labels = []
+        for combo in combos.tolist():
+            values = {field: str(factorized[j][1][code]) for j, (field, code) in enumerate(zip(fields, combo))}
+            labels.append(''.join(literal + (values[field] if field is not None else '') for literal, field in parts))
+
+        remap, labels = pd.factorize(np.asarray(labels, dtype=object))
+        return pd.Categorical.from_codes(remap[codes.reshape(-1)], labels)
+
+    return render
+
+
+def _factorize(column):
+    """
+    (codes, values) of a column; a categorical's categories are the values
+    Missing categorical values get a trailing NaN value, as astype(str) gives 'nan'
+    """
+    if isinstance(getattr(column, 'dtype', None), pd.CategoricalDtype):
+        column = pd.Categorical(column)
+        return column.codes, list(column.categories) + [np.nan]
+    codes, values = pd.factorize(np.asarray(column, dtype=object), use_na_sentinel=False)
+    return codes, list(values)
+
+
+_RULE_SETS = {}
+_rules_lock = threading.Lock()
+
+
+def get_rules(config_path='config.json'):
+    """
+    RuleSet for a config file, recompiled whenever the file changes
+    Checking the modification time is one stat call, so callers can ask
+    before every evaluation and pick up edits without a restart
+    """
+    mtime = os.stat(config_path).st_mtime_ns
+    with _rules_lock:
+        cached = _RULE_SETS.get(config_path)
+        if cached is None or cached[0] != mtime:
+            try:
+                with open(config_path, 'r') as f:
+                    config = json.load(f)
+                rules = RuleSet(config.get('trading_rules'))
+            except (ValueError, AttributeError, TypeError, KeyError) as e:
+                # A half-saved file or a bad rule keeps the last good rules
+                # until the next edit; with none loaded yet there is no fallback
+                if cached is None:
+                    raise
+                warnings.warn(f"Keeping previous trading rules; {config_path} failed to load: {e}")
+                rules = cached[1]
+            cached = (mtime, rules)
+            _RULE_SETS[config_path] = cached
+        return cached[1]
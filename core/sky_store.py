@@ -0,0 +1,122 @@
+"""
+Persistent, incremental store of sky calendar days
+"""
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date
+import pandas as pd
+
+# Bump whenever an engine change alters a stored value; rows written by
+# other versions are ignored and recomputed
+ENGINE_VERSION = 2
+
+DEFAULT_SKY_STORE_PATH = 'cache/sky_calendar.sqlite'
+
+# Sky calendar columns and their SQLite types, in frame order. Every
+# value is a date or an integer code; names are attached when the days
+# are compacted into categoricals. Change times are minutes after local
+# midnight, -1 when there is no (second) change
+SKY_FIELDS = [
+    ('date', 'TEXT'),
+    ('nakshatra_index', 'INTEGER'),
+    ('pada', 'INTEGER'),
+    ('moon_sign_index', 'INTEGER'),
+    ('first_change_minute', 'INTEGER'),
+    ('second_change_minute', 'INTEGER'),
+    ('change_during_market', 'INTEGER'),
+    ('tithi_index', 'INTEGER'),
+    ('yoga_index', 'INTEGER'),
+    ('phase_index', 'INTEGER'),
+    ('retrograde_mask', 'INTEGER')
+]
+
+SKY_COLUMNS = [name for name, _ in SKY_FIELDS]
+
+
+class SkyCalendarStore:
+    """
+    SQLite table of sky calendar days keyed by (ayanamsha, engine version, date)
+
+    Every call opens its own connection, so threads and worker processes
+    can share one file; WAL journaling lets readers run beside a writer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        columns = ', '.join(f'{name} {sql_type}' for name, sql_type in SKY_FIELDS)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            # A table laid out for other columns only holds rows from an
+            # older engine version, which would be ignored anyway
+            existing = [row[1] for row in conn.execute('PRAGMA table_info(sky_days)')]
+            if existing and existing != ['ayanamsha', 'engine_version'] + SKY_COLUMNS:
+                conn.execute('DROP TABLE sky_days')
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS sky_days ('
+                f'ayanamsha TEXT, engine_version INTEGER, {columns}, '
+                f'PRIMARY KEY (ayanamsha, engine_version, date))'
+            )
+
+    def _connect(self):
+        """Connection that commits on success and always closes"""
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        return _Transaction(conn)
+
+    def load(self, ayanamsha, start_date, end_date):
+        """Stored days between two dates inclusive, as a sky calendar frame"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f'SELECT {", ".join(SKY_COLUMNS)} FROM sky_days '
+                f'WHERE ayanamsha = ? AND engine_version = ? AND date BETWEEN ? AND ? ORDER BY date',
+                (ayanamsha, ENGINE_VERSION, start_date.isoformat(), end_date.isoformat())
+            ).fetchall()
+
+        df = pd.DataFrame(rows, columns=SKY_COLUMNS)
+        df['date'] = [date.fromisoformat(d) for d in df['date']]
+        df['change_during_market'] = df['change_during_market'].astype(bool)
+        return df
+
+    def save(self, ayanamsha, df):
+        """Insert or replace the days of a sky calendar frame"""
+        # numpy scalars are unwrapped, since sqlite3 only binds Python types
+        rows = [
+            (ayanamsha, ENGINE_VERSION, row[0].isoformat()) + tuple(
+                v.item() if hasattr(v, 'item') else v for v in row[1:]
+            )
+            for row in df[SKY_COLUMNS].itertuples(index=False, name=None)
+        ]
+        placeholders = ', '.join('?' * (len(SKY_COLUMNS) + 2))
+        with self._connect() as conn:
+            conn.executemany(f'INSERT OR REPLACE INTO sky_days VALUES ({placeholders})', rows)
+
+
+class _Transaction:
+    """Context manager committing (or rolling back) and closing a connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        with closing(self.conn):
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+
+
+_STORES = {}
+
+
+def open_sky_store(path=DEFAULT_SKY_STORE_PATH):
+    """Shared SkyCalendarStore for a path, or None when path is empty"""
+    if not path:
+        return None
+    if path not in _STORES:
+        _STORES[path] = SkyCalendarStore(path)
+    return _STORES[path]
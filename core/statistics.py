@@ -0,0 +1,91 @@
+"""
+Calendar statistics aggregated in one pass and updated incrementally
+"""
+from collections import Counter
+
+# Recommendations reported in the summary, with their summary keys
+RECOMMENDATION_KEYS = [
+    ('TRADE', 'trade_days'),
+    ('LIGHT', 'light_days'),
+    ('AVOID', 'avoid_days'),
+    ('CLOSED', 'closed_days')
+]
+
+
+class CalendarStatistics:
+    """
+    Day counts of a calendar by navatara, recommendation and market-hour change
+
+    Every statistic is a sum over these counts, so one groupby fills them
+    and appending days only adds to them: stats.update(new_days) after
+    extending a calendar, or stats.add(day) for records from iter_calendar.
+    """
+
+    def __init__(self, df=None):
+        self.counts = Counter()
+        self.total_days = 0
+        if df is not None:
+            self.update(df)
+
+    def update(self, df):
+        """Add the days of a calendar frame"""
+        if len(df):
+            sizes = df.groupby(['navatara', 'recommendation', 'change_during_market'], observed=True).size()
+            for (navatara, recommendation, changed), n in sizes.items():
+                self.counts[(navatara, recommendation, bool(changed))] += int(n)
+            self.total_days += len(df)
+        return self
+
+    def add(self, day):
+        """Add one day, e.g. a CalendarDay or a record dict"""
+        self.counts[(day['navatara'], day['recommendation'], bool(day['change_during_market']))] += 1
+        self.total_days += 1
+        return self
+
+    def recommendation_counts(self):
+        """Days per recommendation, most frequent first"""
+        counts = Counter()
+        for (_, recommendation, _), n in self.counts.items():
+            counts[recommendation] += n
+        return dict(counts.most_common())
+
+    def count(self, recommendation):
+        """Days with one recommendation"""
+        return sum(n for (_, rec, _), n in self.counts.items() if rec == recommendation)
+
+    def percentage(self, recommendation):
+        """Share of days with one recommendation, in percent"""
+        total = self.total_days
+        return self.count(recommendation) / total * 100 if total else 0.0
+
+    def summary(self):
+        """Total, per-recommendation and market-hour change day counts"""
+        recommendations = self.recommendation_counts()
+        stats = {'total_days': self.total_days}
+        for recommendation, key in RECOMMENDATION_KEYS:
+            stats[key] = recommendations.get(recommendation, 0)
+        stats['nakshatra_changes_market'] = sum(n for (_, _, changed), n in self.counts.items() if changed)
+        return stats
+
+    def navatara_distribution(self):
+        """Days per navatara, most frequent first"""
+        counts = Counter()
+        for (navatara, _, _), n in self.counts.items():
+            counts[navatara] += n
+        return dict(counts.most_common())
+
+    def recommendations_by_navatara(self):
+        """{recommendation: {navatara: days}}, zero-filled across seen navataras"""
+        navataras = list(self.navatara_distribution())
+        table = {rec: dict.fromkeys(navataras, 0) for rec in self.recommendation_counts()}
+        for (navatara, recommendation, _), n in self.counts.items():
+            table[recommendation][navatara] += n
+        return table
+
+    def to_dict(self):
+        """Statistics in the layout returned by TradingCalendar.get_statistics"""
+        return {
+            'summary': self.summary(),
+            'navatara_distribution': self.navatara_distribution(),
+            'recommendations_by_navatara': self.recommendations_by_navatara()
+        }
@@ -0,0 +1,73 @@
+"""
+Vectorized wall-clock to Julian Day conversion
+"""
+from datetime import datetime
+import numpy as np
+import pytz
+
+# JD of 0h UT on a date is its proleptic Gregorian ordinal plus this
+JD_ORDINAL_OFFSET = 1721424.5
+
+
+def date_to_jd(d):
+    """Julian Day of 0h on a date (or naive datetime, including its time)"""
+    jd = d.toordinal() + JD_ORDINAL_OFFSET
+    if isinstance(d, datetime):
+        jd += (d.hour + d.minute / 60.0 + d.second / 3600.0 + d.microsecond / 3.6e9) / 24.0
+    return jd
+
+
+class TimezoneOffsets:
+    """
+    UTC offsets of a pytz zone, one per transition period
+
+    pytz already stores each zone's transitions (including historical
+    Indian offsets such as the 1942-45 war time), so they are read once into
+    arrays and every later conversion is a searchsorted over them.
+    """
+
+    def __init__(self, tz):
+        tz = pytz.timezone(tz) if isinstance(tz, str) else tz
+        transitions = getattr(tz, '_utc_transition_times', None)
+
+        if transitions:
+            self.jds = np.array([date_to_jd(t) for t in transitions])
+            self.offsets = np.array([info[0].total_seconds() / 86400.0 for info in tz._transition_info])
+        else:
+            self.jds = np.array([-np.inf])
+            self.offsets = np.array([tz.utcoffset(datetime(2000, 1, 1)).total_seconds() / 86400.0])
+
+    def offset_at(self, utc_jds):
+        """UTC offset in days at UTC Julian Days"""
+        i = np.searchsorted(self.jds, utc_jds, side='right') - 1
+        return self.offsets[np.maximum(i, 0)]
+
+    def to_utc(self, local_jds):
+        """
+        Convert wall-clock Julian Days to UT
+        Matches pytz localize() except for wall-clock times skipped or
+        repeated by a DST change, which get one of the two nearby offsets
+        """
+        local_jds = np.asarray(local_jds, dtype=float)
+        utc = local_jds - self.offset_at(local_jds)
+        return local_jds - self.offset_at(utc)
+
+
+_OFFSETS = {}
+
+
+def get_offsets(tz):
+    """Shared TimezoneOffsets for a zone name"""
+    if tz not in _OFFSETS:
+        _OFFSETS[tz] = TimezoneOffsets(tz)
+    return _OFFSETS[tz]
+
+
+def julian_days(dates, wall_time, tz='Asia/Kolkata'):
+    """
+    Julian Days (UT) for the same wall-clock time on every date
+    e.g. julian_days(dates, time(9, 15)) for each market open
+    """
+    hours = wall_time.hour + wall_time.minute / 60.0 + wall_time.second / 3600.0
+    local_jds = np.fromiter((d.toordinal() for d in dates), dtype=float) + JD_ORDINAL_OFFSET + hours / 24.0
+    return get_offsets(tz).to_utc(local_jds)
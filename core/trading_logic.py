@@ -1,153 +1,429 @@
 """
 Trading Logic and Calendar Generator
 """
+import os
 from datetime import datetime, timedelta, date
+import numpy as np
 import pandas as pd
 import json
-from .astro_engine import AstroCalculator
+import copy
+from collections import namedtuple
+from pandas.api.types import union_categoricals
+from .astro_engine import AstroCalculator, SUN_TIMES_PRECISION, MOON_PHASES, get_natal_chart
+from .holidays import DEFAULT_EXCHANGE, get_holiday_calendar
+from .ephemeris import EphemerisExecutor
+from .rules import get_rules
+from .statistics import CalendarStatistics
+from .sky_store import SKY_COLUMNS, DEFAULT_SKY_STORE_PATH, open_sky_store
+from .caches import cached
+
+# Navatara names by (nakshatra distance from birth star) % 9
+NAVATARA_NAMES = [
+    "Janma", "Sampat", "Vipat", "Kshema", "Pratyari",
+    "Sadhana", "Naidhana", "Mitra", "Parama_Mitra"
+]
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Planets checked for retrogression; bit i of a day's mask is planet i
+RETROGRADE_PLANETS = ['Mercury', 'Jupiter', 'Saturn']
+
+# Retrogrades labels indexed by mask, so a categorical's codes are the mask
+RETROGRADE_NAMES = [
+    ', '.join(p for i, p in enumerate(RETROGRADE_PLANETS) if mask >> i & 1) or 'None'
+    for mask in range(1 << len(RETROGRADE_PLANETS))
+]
+
+# Profile-independent sky calendars keyed by (ayanamsha, start, end), at
+# most SKY_CACHE_SIZE ranges
+SKY_CACHE_SIZE = 32
+_SKY_CALENDARS = {}
+
+# Profile-class overlays keyed by (sky key, holidays path, birth nakshatra,
+# birth Moon sign, lagna). There are at most 27 x 12 x 12 = 3888 classes,
+# so the cache holds every class of one range
+CLASS_CACHE_SIZE = 4096
+_CLASS_OVERLAYS = {}
+
+# Hora columns keyed by (sky key, rounded lat, rounded lon); sunrise is
+# cached at that precision, so nearby profiles share one entry
+HORA_CACHE_SIZE = 1024
+_HORA_COLUMNS = {}
+
+# Columns of a generated calendar, in order
+CALENDAR_COLUMNS = [
+    'date', 'weekday', 'nakshatra', 'pada', 'navatara', 'moon_sign',
+    'change_time', 'change_during_market', 'tithi', 'yoga', 'hora_lord',
+    'day_lord', 'moon_phase', 'retrogrades', 'ashtama_moon', 'ashtama_lagna',
+    'is_holiday', 'holiday_name', 'recommendation', 'reasons'
+]
+
+# Columns of a compacted sky calendar, in order
+SKY_CALENDAR_COLUMNS = [
+    'date', 'weekday', 'nakshatra', 'nakshatra_index', 'pada', 'moon_sign',
+    'moon_sign_index', 'change_time', 'change_during_market', 'tithi', 'yoga',
+    'moon_phase', 'retrogrades'
+]
+
+# Days computed per step by iter_calendar
+ITER_CHUNK_DAYS = 31
+
+# Days per shard when a sky calendar is computed across worker processes
+SHARD_DAYS = 366
+
+
+class CalendarDay(namedtuple('CalendarDay', CALENDAR_COLUMNS)):
+    """One calendar day; fields also read by name, as day['nakshatra']"""
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
 
 class TradingCalendar:
-    def __init__(self, profile_data, config_path='config.json', holidays_path='data/nse_holidays.csv'):
+    def __init__(self, profile_data, config_path='config.json', holidays_path=None, ayanamsha=None):
         """Initialize Trading Calendar"""
         self.profile = profile_data
-        self.astro_calc = AstroCalculator()
         
         # Load config
+        self.config_path = config_path
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        # Load holidays
-        try:
-            self.holidays_df = pd.read_csv(holidays_path)
-            self.holidays_df['date'] = pd.to_datetime(self.holidays_df['date'])
-            self.holidays = set(self.holidays_df['date'].dt.date)
-        except:
-            self.holidays = set()
+        self.astro_calc = AstroCalculator(ayanamsha or self.config.get('ayanamsha', 'LAHIRI'))
+        
+        # Persistent sky calendar days, shared across restarts and workers
+        self.sky_store = open_sky_store(self.config.get('sky_store_path', DEFAULT_SKY_STORE_PATH))
+        
+        # Worker processes for computing sky calendars: 1 keeps the work in
+        # this process, 0 uses every core
+        self.workers = self.config.get('workers', 1)
+        self.shard_days = self.config.get('shard_days', SHARD_DAYS)
+        
+        # Exchange holidays, shared by every calendar in the process
+        self.holidays = get_holiday_calendar(self.config.get('exchange', DEFAULT_EXCHANGE), holidays_path)
+        self.holidays_path = self.holidays.path
         
         # Calculate birth chart data
-        self.birth_nakshatra = self._get_birth_nakshatra()
-        self.birth_moon_sign = self._get_birth_moon_sign()
-        self.lagna_sign = self.profile.get('lagna', 'Aries')
-    
-    def _get_birth_nakshatra(self):
-        """Get birth nakshatra"""
-        dob = datetime.fromisoformat(self.profile['dob'])
-        tob = self.profile['tob']
-        
-        birth_dt = datetime.combine(dob.date(), datetime.strptime(tob, '%H:%M').time())
-        jd = self.astro_calc.get_julian_day(birth_dt)
-        moon_long = self.astro_calc.get_moon_position(jd)
-        
-        return self.astro_calc.get_nakshatra(moon_long)
-    
-    def _get_birth_moon_sign(self):
-        """Get birth moon sign"""
-        dob = datetime.fromisoformat(self.profile['dob'])
-        tob = self.profile['tob']
-        
-        birth_dt = datetime.combine(dob.date(), datetime.strptime(tob, '%H:%M').time())
-        jd = self.astro_calc.get_julian_day(birth_dt)
-        moon_long = self.astro_calc.get_moon_position(jd)
-        
-        return self.astro_calc.get_moon_sign(moon_long)
-    
-    def generate_calendar(self, start_date, end_date):
-        """Generate complete trading calendar"""
-        if isinstance(start_date, str):
-            start_date = datetime.fromisoformat(start_date).date()
-        if isinstance(end_date, str):
-            end_date = datetime.fromisoformat(end_date).date()
-        
-        calendar_data = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            day_data = self._analyze_day(current_date)
-            calendar_data.append(day_data)
-            current_date += timedelta(days=1)
-        
-        return pd.DataFrame(calendar_data)
-    
-    def _analyze_day(self, check_date):
-        """Analyze a single day for trading"""
-        # Create datetime at market open
-        dt = datetime.combine(check_date, datetime.strptime('09:15', '%H:%M').time())
-        jd = self.astro_calc.get_julian_day(dt)
-        
-        # Get Moon details
-        moon_long = self.astro_calc.get_moon_position(jd)
-        nakshatra = self.astro_calc.get_nakshatra(moon_long)
-        moon_sign = self.astro_calc.get_moon_sign(moon_long)
-        
-        # Calculate Navatara
-        navatara = self.astro_calc.calculate_navatara(
-            nakshatra['index'],
-            self.birth_nakshatra['index']
+        self._set_natal_chart()
+    
+    def _set_natal_chart(self):
+        """Take birth data from the shared NatalChart for this profile"""
+        self.natal = get_natal_chart(
+            self.profile['dob'], self.profile['tob'],
+            self.profile.get('lat'), self.profile.get('lon'),
+            self.astro_calc.ayanamsha
         )
-        
-        # Find nakshatra change time
-        change_time = self.astro_calc.find_nakshatra_change_time(check_date)
-        change_during_market = self.astro_calc.is_change_during_market_hours(change_time)
-        
-        # Get other panchanga details
-        tithi = self.astro_calc.get_tithi(jd)
-        yoga = self.astro_calc.get_yoga(jd)
-        hora = self.astro_calc.get_hora(dt)
-        moon_phase = self.astro_calc.get_moon_phase(jd)
-        
-        # Check retrograde planets
-        retrogrades = []
-        for planet in ['Mercury', 'Jupiter', 'Saturn']:
-            if self.astro_calc.is_planet_retrograde(jd, planet):
-                retrogrades.append(planet)
-        
-        # Check Ashtama
-        moon_sign_idx = self.astro_calc.zodiac_signs.index(moon_sign)
-        birth_moon_sign_idx = self.astro_calc.zodiac_signs.index(self.birth_moon_sign)
-        lagna_idx = self.astro_calc.zodiac_signs.index(self.lagna_sign)
-        
-        is_ashtama_from_moon = self.astro_calc.calculate_ashtama(moon_sign_idx, birth_moon_sign_idx)
-        is_ashtama_from_lagna = self.astro_calc.calculate_ashtama(moon_sign_idx, lagna_idx)
-        
-        # Determine trading decision
-        decision, reasons = self._get_trading_decision(
-            navatara, 
-            is_ashtama_from_moon, 
-            is_ashtama_from_lagna,
-            change_during_market,
-            moon_phase,
-            retrogrades,
-            check_date in self.holidays,
-            check_date.weekday() in [5, 6]  # Saturday, Sunday
+        self.birth_nakshatra = self.natal.moon_nakshatra
+        self.birth_moon_sign = self.natal.moon_sign
+        # A lagna entered with the profile wins over the computed one
+        self.lagna_sign = self.profile.get('lagna') or self.natal.lagna or 'Aries'
+    
+    def generate_calendar(self, start_date, end_date, workers=None, shard_days=None):
+        """
+        Generate complete trading calendar
+        workers and shard_days override the config for days not yet computed,
+        e.g. workers=0 to spread a long backfill over every core
+        """
+        key = self._sky_key(start_date, end_date)
+        return self._apply_profile(self.get_sky_calendar(start_date, end_date, workers, shard_days), key)
+    
+    def _sky_key(self, start_date, end_date):
+        """Cache key of a date range's sky calendar"""
+        return (self.astro_calc.ayanamsha, _as_date(start_date), _as_date(end_date))
+    
+    def iter_calendar(self, start_date, end_date=None, chunk_days=ITER_CHUNK_DAYS):
+        """
+        Lazily yield CalendarDay records from start_date, open-ended if no
+        end_date is given. Days are computed chunk_days at a time and never
+        held in the in-memory calendar caches, so memory stays nearly flat
+        over decades and the first record arrives after one chunk
+        """
+        chunk_start = _as_date(start_date)
+        end_date = _as_date(end_date) if end_date is not None else None
+        
+        while end_date is None or chunk_start <= end_date:
+            chunk_end = chunk_start + timedelta(days=chunk_days - 1)
+            if end_date is not None:
+                chunk_end = min(chunk_end, end_date)
+            
+            sky = self._load_sky_calendar(chunk_start, chunk_end, workers=1)
+            columns = self._profile_columns(sky)
+            values = [
+                (columns[name] if name in columns else sky[name]).tolist()
+                for name in CALENDAR_COLUMNS
+            ]
+            for row in zip(*values):
+                yield CalendarDay._make(row)
+            
+            chunk_start = chunk_end + timedelta(days=1)
+    
+    def get_sky_calendar(self, start_date, end_date, workers=None, shard_days=None):
+        """
+        Profile-independent panchanga for each date, shared process-wide
+        Nakshatra, tithi, yoga, phase, retrogrades and change times are the
+        same for every user, so each range is computed once per ayanamsha.
+        The returned frame is shared; treat it as read-only
+        """
+        key = self._sky_key(start_date, end_date)
+        return cached(
+            _SKY_CALENDARS, SKY_CACHE_SIZE, key,
+            lambda: self._load_sky_calendar(*key[1:], workers=workers, shard_days=shard_days)
+        )
+    
+    def _load_sky_calendar(self, start_date, end_date, workers=None, shard_days=None):
+        """
+        Sky calendar from the persistent store, computing only missing days
+        Each contiguous run of missing days is built and appended to the store
+        """
+        if self.sky_store is None:
+            return self._compact_sky(self._build_sky_calendar(start_date, end_date, workers, shard_days))
+        
+        ayanamsha = self.astro_calc.ayanamsha
+        stored = self.sky_store.load(ayanamsha, start_date, end_date)
+        parts = [stored] if len(stored) else []
+        
+        for run_start, run_end in _missing_runs(start_date, end_date, set(stored['date'])):
+            part = self._build_sky_calendar(run_start, run_end, workers, shard_days)
+            self.sky_store.save(ayanamsha, part)
+            parts.append(part)
+        
+        if len(parts) == 1:
+            return self._compact_sky(parts[0])
+        if not parts:
+            return self._compact_sky(stored)
+        return self._compact_sky(pd.concat(parts).sort_values('date').reset_index(drop=True))
+    
+    def _compact_sky(self, sky):
+        """
+        Sky calendar with small-integer and categorical columns
+        Built from the integer codes of a raw sky frame with
+        Categorical.from_codes, so names are held once per category; only
+        change times, which are mostly distinct, get one label per value
+        """
+        calc = self.astro_calc
+        dates = sky['date'].to_numpy(dtype=object)
+        nakshatra_index = sky['nakshatra_index'].to_numpy().astype(np.int8)
+        moon_sign_index = sky['moon_sign_index'].to_numpy().astype(np.int8)
+        tithis = [f"{'Shukla' if i < 15 else 'Krishna'} {name}" for i, name in enumerate(calc.tithi_names)]
+        # 1970-01-01 was a Thursday, weekday 3
+        weekdays = (np.array(dates, dtype='datetime64[D]').astype(np.int64) + 3) % 7
+        
+        return pd.DataFrame({
+            'date': dates,
+            'weekday': pd.Categorical.from_codes(weekdays.astype(np.int8), WEEKDAY_NAMES),
+            'nakshatra': pd.Categorical.from_codes(nakshatra_index, calc.nakshatras),
+            'nakshatra_index': nakshatra_index,
+            'pada': sky['pada'].to_numpy().astype(np.int8),
+            'moon_sign': pd.Categorical.from_codes(moon_sign_index, calc.zodiac_signs),
+            'moon_sign_index': moon_sign_index,
+            'change_time': _change_time_column(
+                sky['first_change_minute'].to_numpy(), sky['second_change_minute'].to_numpy()
+            ),
+            'change_during_market': sky['change_during_market'].to_numpy(dtype=bool),
+            'tithi': pd.Categorical.from_codes(sky['tithi_index'].to_numpy().astype(np.int8), tithis),
+            'yoga': pd.Categorical.from_codes(sky['yoga_index'].to_numpy().astype(np.int8), calc.yoga_names),
+            'moon_phase': pd.Categorical.from_codes(sky['phase_index'].to_numpy().astype(np.int8), MOON_PHASES),
+            'retrogrades': pd.Categorical.from_codes(sky['retrograde_mask'].to_numpy().astype(np.int8), RETROGRADE_NAMES)
+        }, columns=SKY_CALENDAR_COLUMNS)
+    
+    def profile_class(self):
+        """
+        Birth nakshatra, birth Moon sign and lagna indexes
+        Profiles in the same class get the same navatara, ashtama and
+        decisions on every date
+        """
+        signs = self.astro_calc.zodiac_signs
+        return (
+            self.birth_nakshatra['index'],
+            signs.index(self.birth_moon_sign),
+            signs.index(self.lagna_sign)
+        )
+    
+    def _build_sky_calendar(self, start_date, end_date, workers=None, shard_days=None):
+        """
+        Compute the sky calendar for a date range
+        With more than one worker the range is cut into shards of
+        shard_days, computed in parallel and merged back in date order
+        """
+        workers = self.workers if workers is None else workers
+        shard_days = shard_days or self.shard_days
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        
+        shards = _date_shards(start_date, end_date, shard_days)
+        if workers == 1 or len(shards) < 2:
+            return _build_sky_days(self.astro_calc, start_date, end_date)
+        
+        ayanamsha = self.astro_calc.ayanamsha
+        with EphemerisExecutor(min(workers, len(shards)), ayanamsha) as pool:
+            parts = list(pool.map(
+                _build_sky_shard,
+                [ayanamsha] * len(shards), [self.astro_calc.almanac_path] * len(shards),
+                [start for start, _ in shards], [end for _, end in shards]
+            ))
+        return pd.concat(parts, ignore_index=True)
+    
+    def _apply_profile(self, sky, sky_key=None):
+        """
+        Overlay this profile on a sky calendar
+        With a sky_key, the class overlay and hora columns come from the
+        process-wide caches, so a profile whose class and location were seen
+        before costs only a frame assembly
+        """
+        columns = self._profile_columns(sky, sky_key)
+        
+        # Deep copy so callers cannot write through to cached columns
+        return pd.DataFrame({
+            name: columns[name] if name in columns else sky[name]
+            for name in CALENDAR_COLUMNS
+        }).copy()
+    
+    def _profile_columns(self, sky, sky_key=None):
+        """Profile-dependent columns: the class overlay plus hora lords"""
+        rules = self.get_rules()
+        if sky_key is None:
+            return {**self._class_overlay(sky, rules), **self._hora_columns(sky)}
+        
+        overlay = cached(
+            _CLASS_OVERLAYS, CLASS_CACHE_SIZE,
+            (sky_key, self.holidays_path, rules.key) + self.profile_class(),
+            lambda: self._class_overlay(sky, rules)
         )
+        location = (round(self.profile['lat'], SUN_TIMES_PRECISION), round(self.profile['lon'], SUN_TIMES_PRECISION)) \
+            if self._has_location() else None
+        horas = cached(_HORA_COLUMNS, HORA_CACHE_SIZE, (sky_key, location), lambda: self._hora_columns(sky))
+        return {**overlay, **horas}
+    
+    def _class_overlay(self, sky, rules):
+        """
+        Navatara, ashtama, holidays and decisions over a sky calendar
+        Depends only on profile_class(), the holiday list and the rules
+        """
+        birth_nakshatra_idx, birth_moon_sign_idx, lagna_idx = self.profile_class()
+        dates = sky['date'].tolist()
+        nakshatra_idx = sky['nakshatra_index'].to_numpy()
+        moon_sign_idx = sky['moon_sign_index'].to_numpy()
+        
+        navatara = pd.Categorical.from_codes(
+            ((nakshatra_idx.astype(np.int16) - birth_nakshatra_idx) % 27 % 9).astype(np.int8), NAVATARA_NAMES
+        )
+        ashtama_moon = (moon_sign_idx - birth_moon_sign_idx) % 12 == 7
+        ashtama_lagna = (moon_sign_idx - lagna_idx) % 12 == 7
+        is_holiday, is_weekend = self._closures(dates)
+        
+        recommendations, reasons = rules.evaluate({
+            **sky,
+            'navatara': navatara,
+            'ashtama_moon': ashtama_moon,
+            'ashtama_lagna': ashtama_lagna,
+            'is_holiday': is_holiday,
+            'is_weekend': is_weekend
+        })
         
         return {
-            'date': check_date,
-            'weekday': check_date.strftime('%A'),
-            'nakshatra': nakshatra['name'],
-            'pada': nakshatra['pada'],
             'navatara': navatara,
-            'moon_sign': moon_sign,
-            'change_time': change_time.strftime('%H:%M') if change_time else 'No change',
-            'change_during_market': change_during_market,
-            'tithi': f"{tithi['paksha']} {tithi['name']}",
-            'yoga': yoga,
-            'hora_lord': hora['lord'],
-            'day_lord': hora['day_lord'],
-            'moon_phase': moon_phase,
-            'retrogrades': ', '.join(retrogrades) if retrogrades else 'None',
-            'ashtama_moon': is_ashtama_from_moon,
-            'ashtama_lagna': is_ashtama_from_lagna,
-            'is_holiday': check_date in self.holidays,
-            'holiday_name': self._get_holiday_name(check_date),
-            'recommendation': decision,
-            'reasons': ' | '.join(reasons)
+            'ashtama_moon': ashtama_moon,
+            'ashtama_lagna': ashtama_lagna,
+            'is_holiday': is_holiday,
+            'holiday_name': pd.Categorical([self.holidays.label(d) for d in dates]),
+            'recommendation': recommendations,
+            'reasons': reasons
+        }
+    
+    def _closures(self, dates):
+        """
+        Holiday and weekend masks for the rules
+        A special session such as Muhurat trading opens the exchange, so its
+        day counts as neither, even on a holiday or a Sunday
+        """
+        session = self.holidays.is_special_session(dates)
+        return self.holidays.is_holiday(dates) & ~session, self.holidays.is_weekend(dates) & ~session
+    
+    def _hora_columns(self, sky):
+        """Hora and day lords at each market open for this profile's location"""
+        dates = sky['date'].tolist()
+        lat, lon = self.profile.get('lat'), self.profile.get('lon')
+        if dates and self._has_location():
+            self.astro_calc.fill_sun_times(dates[0] - timedelta(days=1), dates[-1] + timedelta(days=1), lat, lon)
+        
+        market_open = datetime.strptime('09:15', '%H:%M').time()
+        horas = [self.astro_calc.get_hora(datetime.combine(d, market_open), lat, lon) for d in dates]
+        lords = self.astro_calc.hora_lords
+        return {
+            'hora_lord': pd.Categorical([h['lord'] for h in horas], categories=lords),
+            'day_lord': pd.Categorical([h['day_lord'] for h in horas], categories=lords)
         }
     
+    def for_profile(self, profile_data):
+        """
+        Calendar for another profile sharing this one's config, holidays
+        and calculator; its birth chart comes from the shared NatalChart cache
+        """
+        calendar = copy.copy(self)
+        calendar.profile = profile_data
+        calendar._set_natal_chart()
+        return calendar
+    
+    def generate_calendars_by_ayanamsha(self, start_date, end_date, ayanamshas):
+        """
+        Generate comparable calendars under several ayanamshas
+        Returns {ayanamsha: DataFrame}. The tropical ephemeris is fitted once
+        and shared; each ayanamsha only adds its offset and its own birth chart
+        """
+        calendars = {}
+        for ayanamsha in ayanamshas:
+            calendar = copy.copy(self)
+            calendar.astro_calc = AstroCalculator(ayanamsha, self.astro_calc.almanac_path)
+            calendar._set_natal_chart()
+            calendars[ayanamsha] = calendar.generate_calendar(start_date, end_date)
+        return calendars
+    
+    def _has_location(self):
+        """Check whether the profile carries coordinates for sunrise-based hora"""
+        return self.profile.get('lat') is not None and self.profile.get('lon') is not None
+    
+    def _analyze_day(self, check_date, sky=None):
+        """
+        Analyze a single day for trading
+        sky is the SkySnapshot at market open, fetched if not given
+        """
+        if sky is None:
+            dt = datetime.combine(check_date, datetime.strptime('09:15', '%H:%M').time())
+            sky = self.astro_calc.get_snapshot(self.astro_calc.get_julian_day(dt))
+        
+        sky_day = self._compact_sky(pd.DataFrame([_sky_row(self.astro_calc, check_date, sky)], columns=SKY_COLUMNS))
+        return self._apply_profile(sky_day).to_dict('records')[0]
+    
+    def get_rules(self):
+        """Trading rules from this calendar's config file, reloaded when it changes"""
+        return get_rules(self.config_path)
+    
+    def apply_rules(self, df, rules=None):
+        """
+        Re-decide an existing calendar under a rule set, without ephemeris work
+        rules defaults to the current config; returns a new frame
+        """
+        rules = rules or self.get_rules()
+        columns = {name: df[name] for name in df.columns}
+        columns['is_weekend'] = self._closures(df['date'].tolist())[1]
+        
+        recommendations, reasons = rules.evaluate(columns)
+        result = df.copy()
+        result['recommendation'] = recommendations
+        result['reasons'] = reasons
+        return result
+    
     def _get_trading_decision(self, navatara, ashtama_moon, ashtama_lagna, 
                              change_during_market, moon_phase, retrogrades,
                              is_holiday, is_weekend):
-        """Determine trading recommendation"""
+        """
+        Reference decision for one day under the default rules, kept as
+        plain Python so the compiled RuleSet can be checked against it;
+        calendars themselves are decided by the configured RuleSet
+        """
         reasons = []
         
         # Market closed
@@ -191,34 +467,203 @@ class TradingCalendar:
         return 'TRADE', reasons
     
     def _get_holiday_name(self, check_date):
-        """Get holiday name if it's a holiday"""
-        if check_date not in self.holidays:
-            return ''
-        
-        holiday_row = self.holidays_df[self.holidays_df['date'].dt.date == check_date]
-        if not holiday_row.empty:
-            return holiday_row.iloc[0]['description']
-        return ''
+        """Holiday name, or a special session with its hours, on a date"""
+        return self.holidays.label(check_date)
     
     def get_statistics(self, df):
-        """Calculate trading statistics"""
-        stats = {
-            'total_days': len(df),
-            'trade_days': len(df[df['recommendation'] == 'TRADE']),
-            'light_days': len(df[df['recommendation'] == 'LIGHT']),
-            'avoid_days': len(df[df['recommendation'] == 'AVOID']),
-            'closed_days': len(df[df['recommendation'] == 'CLOSED']),
-            'nakshatra_changes_market': len(df[df['change_during_market'] == True])
-        }
-        
-        # Navatara distribution
-        navatara_dist = df['navatara'].value_counts().to_dict()
-        
-        # Recommendations by navatara
-        rec_by_navatara = df.groupby('navatara')['recommendation'].value_counts().unstack(fill_value=0).to_dict()
-        
+        """Calculate trading statistics in one pass over the calendar"""
+        return CalendarStatistics(df).to_dict()
+
+
+def _as_date(value):
+    """Normalise an ISO string, datetime or date to a date"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return value
+
+
+def _build_sky_days(calc, start_date, end_date):
+    """Compute the raw (uncompacted) sky calendar for a date range"""
+    dates = []
+    current_date = start_date
+    
+    while current_date <= end_date:
+        dates.append(current_date)
+        current_date += timedelta(days=1)
+    
+    # Fetch every body for every market open in one batch
+    jds = calc.get_julian_days(dates, datetime.strptime('09:15', '%H:%M').time())
+    
+    # Interpolate the Moon and Sun across the whole run, with a day of
+    # margin for the nakshatra change search around midnight
+    if dates:
+        calc.prepare_range(jds[0] - 1.0, jds[-1] + 1.0)
+        calc.build_transition_index(jds[0] - 1.0, jds[-1] + 1.0)
+        calc.build_station_index(jds[0] - 1.0, jds[-1] + 1.0)
+    
+    # Retrogrades come from the station index, so only the luminaries
+    # need fetching per day
+    snapshots = calc.get_snapshots(jds, ['Sun', 'Moon'])
+    
+    return pd.DataFrame(
+        [_sky_row(calc, check_date, sky) for check_date, sky in zip(dates, snapshots)],
+        columns=SKY_COLUMNS
+    )
+
+
+def _sky_row(calc, check_date, sky):
+    """
+    Profile-independent fields for one day from its market-open SkySnapshot
+    Every field is an integer code; names are attached by _compact_sky
+    """
+    # Get Moon details
+    moon_long = sky.longitudes['Moon']
+    nakshatra = calc.get_nakshatra(moon_long)
+    
+    # Find nakshatra change times (a fast Moon can cross two in a day)
+    change_times = calc.find_nakshatra_change_times(check_date)
+    change_during_market = any(
+        calc.is_change_during_market_hours(t) for t in change_times
+    )
+    change_minutes = [t.hour * 60 + t.minute for t in change_times] + [-1, -1]
+    
+    # Check retrograde planets; bit i is RETROGRADE_PLANETS[i]
+    retrograde_mask = 0
+    for i, planet in enumerate(RETROGRADE_PLANETS):
+        if calc.is_planet_retrograde(sky, planet):
+            retrograde_mask |= 1 << i
+    
+    return {
+        'date': check_date,
+        'nakshatra_index': nakshatra['index'],
+        'pada': nakshatra['pada'],
+        'moon_sign_index': int(moon_long / 30.0),
+        'first_change_minute': change_minutes[0],
+        'second_change_minute': change_minutes[1],
+        'change_during_market': change_during_market,
+        'tithi_index': calc.get_tithi(sky)['number'] - 1,
+        'yoga_index': calc.get_yoga_index(sky),
+        'phase_index': calc.get_moon_phase_index(sky),
+        'retrograde_mask': retrograde_mask
+    }
+
+
+def _change_time_column(first, second):
+    """
+    'HH:MM[, HH:MM]' change times as a categorical, from minute codes
+    Each distinct pair of minutes is formatted once
+    """
+    pairs, codes = np.unique((first.astype(np.int32) + 1) * 1441 + second + 1, return_inverse=True)
+    labels = [
+        ', '.join(f'{m // 60:02d}:{m % 60:02d}' for m in (pair // 1441 - 1, pair % 1441 - 1) if m >= 0) or 'No change'
+        for pair in pairs.tolist()
+    ]
+    return pd.Categorical.from_codes(codes.reshape(-1), labels)
+
+
+# Calculators owned by a worker process, keyed by (ayanamsha, almanac path),
+# so every shard a worker takes reuses its fits and indexes
+_WORKER_CALCULATORS = {}
+
+
+def _build_sky_shard(ayanamsha, almanac_path, start_date, end_date):
+    """Compute one shard of a sky calendar; runs in an EphemerisExecutor worker"""
+    key = (ayanamsha, almanac_path)
+    if key not in _WORKER_CALCULATORS:
+        _WORKER_CALCULATORS[key] = AstroCalculator(ayanamsha, almanac_path)
+    return _build_sky_days(_WORKER_CALCULATORS[key], start_date, end_date)
+
+
+def _date_shards(start_date, end_date, shard_days):
+    """(start, end) date runs of at most shard_days covering a range"""
+    shards = []
+    current_date = start_date
+    
+    while current_date <= end_date:
+        shard_end = min(current_date + timedelta(days=shard_days - 1), end_date)
+        shards.append((current_date, shard_end))
+        current_date = shard_end + timedelta(days=1)
+    
+    return shards
+
+
+def _missing_runs(start_date, end_date, have):
+    """Contiguous (start, end) date runs in a range that are not in have"""
+    runs = []
+    current_date = start_date
+    
+    while current_date <= end_date:
+        if current_date not in have:
+            if runs and runs[-1][1] == current_date - timedelta(days=1):
+                runs[-1] = (runs[-1][0], current_date)
+            else:
+                runs.append((current_date, current_date))
+        current_date += timedelta(days=1)
+    
+    return runs
+
+
+def _concat(arrays):
+    """Concatenate column arrays, keeping categoricals categorical"""
+    if isinstance(arrays[0], pd.Categorical):
+        return union_categoricals(arrays)
+    return np.concatenate(arrays)
+
+
+def _tile(column, reps):
+    """Repeat a whole column reps times, tiling only the codes of a categorical"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.tile(column.cat.codes.to_numpy(), reps), dtype=column.dtype)
+    return np.tile(column.to_numpy(), reps)
+
+
+def build_calendar(profile_data, start_date, end_date):
+    """
+    Generate one profile's calendar
+    Module-level so it can be submitted to an EphemerisExecutor worker
+    """
+    return TradingCalendar(profile_data).generate_calendar(start_date, end_date)
+
+
+def generate_calendars(profiles, start_date, end_date, long_format=False,
+                       config_path='config.json', holidays_path=None):
+    """
+    Generate calendars for many profiles in one run
+    profiles is a dict {name: profile_data}, or a list keyed by position.
+    Config and holidays are loaded once, birth charts come from the shared
+    NatalChart cache, and every profile overlays the same sky calendar.
+    Returns {key: DataFrame}, or with long_format one frame with a leading
+    'profile' column
+    """
+    items = list(profiles.items() if isinstance(profiles, dict) else enumerate(profiles))
+    if not items:
+        return pd.DataFrame() if long_format else {}
+    
+    base = TradingCalendar(items[0][1], config_path, holidays_path)
+    sky_key = base._sky_key(start_date, end_date)
+    sky = base.get_sky_calendar(start_date, end_date)
+    
+    if not long_format:
         return {
-            'summary': stats,
-            'navatara_distribution': navatara_dist,
-            'recommendations_by_navatara': rec_by_navatara
+            key: base.for_profile(profile_data)._apply_profile(sky, sky_key)
+            for key, profile_data in items
         }
+    
+    # One frame built from concatenated columns; most overlays are cache
+    # hits, so this avoids constructing a DataFrame per profile
+    columns = [
+        base.for_profile(profile_data)._profile_columns(sky, sky_key)
+        for _, profile_data in items
+    ]
+    long_columns = {
+        'profile': pd.Categorical.from_codes(np.repeat(np.arange(len(items)), len(sky)), [key for key, _ in items])
+    }
+    for name in CALENDAR_COLUMNS:
+        if name in columns[0]:
+            long_columns[name] = _concat([c[name] for c in columns])
+        else:
+            long_columns[name] = _tile(sky[name], len(items))
+    
+    return pd.DataFrame(long_columns)
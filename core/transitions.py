@@ -0,0 +1,60 @@
+"""
+Sorted transition indexes for O(log n) lookups of astrological states
+"""
+from bisect import bisect_left, bisect_right
+
+
+class TransitionIndex:
+    """
+    Sorted list of (jd, new_value) transitions over a Julian Day span
+
+    initial is the value in force at jd_start. Lookups bisect the JD list,
+    so any instant or window in the span is answered without touching the
+    ephemeris.
+    """
+
+    def __init__(self, jd_start, jd_end, jds, values, initial):
+        self.jd_start = jd_start
+        self.jd_end = jd_end
+        self.jds = list(jds)
+        self.values = list(values)
+        self.initial = initial
+
+    def __len__(self):
+        return len(self.jds)
+
+    def covers(self, jd_start, jd_end):
+        """Check whether the index spans the given window"""
+        return self.jd_start <= jd_start and jd_end <= self.jd_end
+
+    def value_at(self, jd):
+        """Value in force at a Julian Day"""
+        i = bisect_right(self.jds, jd)
+        return self.values[i - 1] if i > 0 else self.initial
+
+    def between(self, jd_start, jd_end):
+        """Transitions with jd_start <= jd < jd_end, as (jd, new_value) tuples"""
+        lo = bisect_left(self.jds, jd_start)
+        hi = bisect_left(self.jds, jd_end)
+        return list(zip(self.jds[lo:hi], self.values[lo:hi]))
+
+    def merge(self, other):
+        """
+        Combine with an index over an overlapping or adjacent span
+        Transitions from self win where the two overlap
+        """
+        if other.jd_start < self.jd_start:
+            head = other.between(other.jd_start, self.jd_start)
+            initial = other.initial
+        else:
+            head, initial = [], self.initial
+        tail = other.between(self.jd_end, other.jd_end) if other.jd_end > self.jd_end else []
+
+        items = head + list(zip(self.jds, self.values)) + tail
+        return TransitionIndex(
+            min(self.jd_start, other.jd_start),
+            max(self.jd_end, other.jd_end),
+            [jd for jd, _ in items],
+            [value for _, value in items],
+            initial
+        )
@@ -79,6 +79,15 @@ else
     echo "✅ Swiss Ephemeris files found"
 fi
 
+# Build the precomputed almanac
+echo ""
+echo "🌙 Building almanac (1900-2100)..."
+if [ -f "almanac/almanac.bin" ]; then
+    echo "✅ Almanac found"
+else
+    python build_almanac.py && echo "✅ Almanac built" || echo "⚠️  Almanac build failed; calculations will use Swiss Ephemeris directly"
+fi
+
 # Check configuration files
 echo ""
 echo "⚙️  Checking configuration files..."
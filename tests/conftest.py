@@ -0,0 +1,21 @@
+"""
+Shared fixtures: calendars built from config.json without the persistent sky store
+"""
+import json
+import pytest
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Copy of config.json with the sky store disabled"""
+    with open('config.json') as f:
+        config = json.load(f)
+    config['sky_store_path'] = ''
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+@pytest.fixture
+def profile():
+    return {"dob": "1983-11-21", "tob": "05:50", "lat": 28.661, "lon": 77.133, "lagna": "Libra"}
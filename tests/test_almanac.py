@@ -0,0 +1,81 @@
+"""
+Almanac files written, memory-mapped back and checked against the ephemeris
+"""
+import numpy as np
+import pytest
+from core import astro_engine
+from core.almanac import ALMANAC_VERSION, HEADER_DTYPE, Almanac, write_almanac
+from core.astro_engine import AstroCalculator, STATION_STEPS
+
+J0 = 2460310.5  # 2024-01-01
+SPAN = 400.0
+TOLERANCE = 1e-5  # days, ~1 second
+
+
+@pytest.fixture
+def almanac_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    return write_almanac(str(tmp_path / 'almanac.bin'), AstroCalculator(almanac_path=None), J0, J0 + SPAN)
+
+
+@pytest.fixture
+def calcs(almanac_path, monkeypatch):
+    """(almanac-backed, ephemeris-only) calculators with empty shared indexes"""
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    mapped = AstroCalculator(almanac_path=almanac_path)
+    assert mapped.almanac is not None
+    return mapped, AstroCalculator(almanac_path=None)
+
+
+def _assert_same_events(found, expected):
+    assert [value for _, value in found] == [value for _, value in expected]
+    assert np.allclose([jd for jd, _ in found], [jd for jd, _ in expected], rtol=0, atol=TOLERANCE)
+
+
+@pytest.mark.parametrize('kind', ['nakshatra', 'pada', 'tithi', 'yoga', 'moon_sign'])
+def test_boundaries_match_ephemeris(calcs, kind):
+    mapped, direct = calcs
+    found = mapped.find_boundaries(kind, J0 + 10.3, J0 + 40.7)
+    assert found
+    _assert_same_events(found, direct._solve_boundaries(kind, J0 + 10.3, J0 + 40.7))
+
+
+def test_stations_and_retrogrades_match_ephemeris(calcs):
+    mapped, direct = calcs
+    for planet in STATION_STEPS:
+        for jd in np.linspace(J0, J0 + SPAN - 200, 25).tolist():
+            assert mapped.is_planet_retrograde(jd, planet) == (direct._planet_speed(jd, planet) < 0), (planet, jd)
+
+    for planet, jd in [('Mercury', J0 + 10), ('Mercury', J0 + 150), ('Jupiter', J0)]:
+        assert mapped.get_station_index(planet, jd, jd + astro_engine.STATION_LOOKAHEADS[planet]) is not None
+        station_jd, retrograde = mapped.get_next_station(jd, planet)
+        expected_jd, expected_retrograde = direct.get_next_station(jd, planet)
+        assert retrograde == expected_retrograde
+        assert abs(station_jd - expected_jd) < 1e-3  # stations are solved to a speed tolerance
+
+
+def test_eclipses_match_ephemeris(calcs):
+    mapped, direct = calcs
+    eclipses = mapped.get_eclipses(J0, J0 + SPAN)
+    assert len(eclipses) >= 4
+    assert mapped.almanac.index('solar_eclipse', J0, J0 + SPAN) is not None
+    assert [(kind, flags) for _, kind, flags in eclipses] == \
+        [(kind, flags) for _, kind, flags in direct.get_eclipses(J0, J0 + SPAN)]
+    assert np.allclose([jd for jd, _, _ in eclipses], [jd for jd, _, _ in direct.get_eclipses(J0, J0 + SPAN)])
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('magic', b'NOTALMNC', 'not an almanac'),
+    ('version', ALMANAC_VERSION + 1, 'almanac version')
+])
+def test_mismatched_header_raises(almanac_path, field, value, message):
+    with open(almanac_path, 'r+b') as f:
+        header = np.frombuffer(f.read(HEADER_DTYPE.itemsize), dtype=HEADER_DTYPE).copy()
+        header[field] = value
+        f.seek(0)
+        f.write(header.tobytes())
+
+    with pytest.raises(ValueError, match=message):
+        Almanac(almanac_path)
@@ -0,0 +1,49 @@
+"""
+Batch calendar generation against one TradingCalendar per profile
+"""
+from core.trading_logic import TradingCalendar, generate_calendars
+
+PROFILES = {
+    'delhi': {"dob": "1983-11-21", "tob": "05:50", "lat": 28.661, "lon": 77.133, "lagna": "Libra"},
+    'mumbai': {"dob": "1990-04-02", "tob": "22:10", "lat": 19.076, "lon": 72.878},
+    'no_place': {"dob": "1975-08-15", "tob": "12:00"},
+    'delhi_twin': {"dob": "1983-11-21", "tob": "05:50", "lat": 28.661, "lon": 77.133, "lagna": "Libra"}
+}
+
+START, END = '2024-01-01', '2024-03-31'
+
+
+def _looped(config_path):
+    return {
+        key: TradingCalendar(profile, config_path).generate_calendar(START, END)
+        for key, profile in PROFILES.items()
+    }
+
+
+def test_dict_output_matches_loop(config_path):
+    expected = _looped(config_path)
+    calendars = generate_calendars(PROFILES, START, END, config_path=config_path)
+    assert list(calendars) == list(PROFILES)
+    for key, df in expected.items():
+        assert calendars[key].equals(df), key
+
+    # A list is keyed by position
+    by_position = generate_calendars(list(PROFILES.values()), START, END, config_path=config_path)
+    assert [by_position[i].equals(df) for i, df in enumerate(expected.values())] == [True] * len(PROFILES)
+
+
+def test_long_format_matches_loop(config_path):
+    expected = _looped(config_path)
+    long_frame = generate_calendars(PROFILES, START, END, long_format=True, config_path=config_path)
+    assert list(long_frame.columns) == ['profile'] + list(expected['delhi'].columns)
+    assert len(long_frame) == sum(len(df) for df in expected.values())
+
+    for key, df in expected.items():
+        part = long_frame[long_frame['profile'] == key].drop(columns='profile').reset_index(drop=True)
+        # Long-format categoricals hold the union of every profile's categories
+        assert part.astype(object).equals(df.astype(object)), key
+
+
+def test_no_profiles():
+    assert generate_calendars({}, START, END) == {}
+    assert generate_calendars([], START, END, long_format=True).empty
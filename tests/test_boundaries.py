@@ -0,0 +1,58 @@
+"""
+Panchanga boundary solving against swisseph at the solved times
+"""
+from datetime import date, datetime
+import pytest
+import swisseph as swe
+from core import astro_engine, trading_logic
+from core.astro_engine import AstroCalculator, BOUNDARY_SPANS
+from core.timezones import julian_days
+from core.trading_logic import TradingCalendar
+
+TWO_NAKSHATRA_DAY = date(2020, 1, 19)
+
+
+def _angle(calc, kind, jd):
+    """Element angle from swisseph's sidereal Moon and Sun"""
+    with calc.ephemeris():
+        moon = swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL)[0][0]
+        sun = swe.calc_ut(jd, swe.SUN, swe.FLG_SIDEREAL)[0][0]
+    if kind == 'tithi':
+        return (moon - sun) % 360
+    if kind == 'yoga':
+        return (sun + moon) % 360
+    return moon
+
+
+def _day_window(day):
+    return julian_days([day, date.fromordinal(day.toordinal() + 1)], datetime.min.time()).tolist()
+
+
+@pytest.fixture
+def calc(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    return AstroCalculator(almanac_path=None)
+
+
+def test_two_nakshatra_changes_in_one_day(calc):
+    times = [t.strftime('%H:%M') for t in calc.find_nakshatra_change_times(TWO_NAKSHATRA_DAY)]
+    assert times == ['00:15', '23:41']
+
+
+@pytest.mark.parametrize('kind', ['nakshatra', 'tithi', 'yoga'])
+def test_solved_times_sit_on_boundaries(calc, kind):
+    span = BOUNDARY_SPANS[kind]
+    crossings = calc.find_boundaries(kind, *_day_window(TWO_NAKSHATRA_DAY))
+    assert len(crossings) == (2 if kind == 'nakshatra' else 1)
+
+    for jd, index in crossings:
+        error = (_angle(calc, kind, jd) - index * span + 180.0) % 360.0 - 180.0
+        assert abs(error) < 1e-4  # degrees, about a second of Moon motion
+        assert int(_angle(calc, kind, jd - 1e-4) / span) % round(360 / span) == (index - 1) % round(360 / span)
+        assert int(_angle(calc, kind, jd + 1e-4) / span) % round(360 / span) == index
+
+
+def test_calendar_shows_both_changes(config_path, profile, monkeypatch):
+    monkeypatch.setattr(trading_logic, '_SKY_CALENDARS', {})
+    df = TradingCalendar(profile, config_path).generate_calendar(TWO_NAKSHATRA_DAY, TWO_NAKSHATRA_DAY)
+    assert df['change_time'].tolist() == ['00:15, 23:41']
@@ -0,0 +1,79 @@
+"""
+Process-wide sky, class overlay and hora caches behind generate_calendar
+"""
+import json
+import os
+import pytest
+from core import trading_logic
+from core.trading_logic import TradingCalendar
+
+START, END = '2024-01-01', '2024-03-31'
+
+# Same birth data and lagna, so the same profile class, in two cities
+MUMBAI = {"dob": "1983-11-21", "tob": "05:50", "lat": 19.076, "lon": 72.878, "lagna": "Libra"}
+KOLKATA = {"dob": "1983-11-21", "tob": "05:50", "lat": 22.573, "lon": 88.364, "lagna": "Libra"}
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    for name in ['_SKY_CALENDARS', '_CLASS_OVERLAYS', '_HORA_COLUMNS']:
+        monkeypatch.setattr(trading_logic, name, {})
+
+
+def test_same_class_shares_overlay_but_not_horas(config_path):
+    mumbai = TradingCalendar(MUMBAI, config_path)
+    kolkata = TradingCalendar(KOLKATA, config_path)
+    assert mumbai.profile_class() == kolkata.profile_class()
+
+    sky = mumbai.get_sky_calendar(START, END)
+    assert kolkata.get_sky_calendar(START, END) is sky
+    key = mumbai._sky_key(START, END)
+    mumbai_columns = mumbai._profile_columns(sky, key)
+    kolkata_columns = kolkata._profile_columns(sky, key)
+
+    assert len(trading_logic._SKY_CALENDARS) == 1
+    assert len(trading_logic._CLASS_OVERLAYS) == 1
+    assert len(trading_logic._HORA_COLUMNS) == 2
+    assert mumbai_columns['recommendation'] is kolkata_columns['recommendation']
+    assert list(mumbai_columns['hora_lord']) != list(kolkata_columns['hora_lord'])
+
+    # Each calendar still matches one built without the caches
+    for calendar, columns in [(mumbai, mumbai_columns), (kolkata, kolkata_columns)]:
+        uncached = calendar._profile_columns(sky)
+        assert list(columns['hora_lord']) == list(uncached['hora_lord'])
+        assert list(columns['reasons']) == list(uncached['reasons'])
+
+
+def test_rule_change_misses_overlay_cache(config_path):
+    calendar = TradingCalendar(MUMBAI, config_path)
+    before = calendar.generate_calendar(START, END)
+    assert len(trading_logic._CLASS_OVERLAYS) == 1
+
+    with open(config_path) as f:
+        config = json.load(f)
+    config['trading_rules']['rules'] = [{'when': 'is_weekend', 'then': 'CLOSED', 'reason': 'Weekend'}]
+    with open(config_path, 'w') as f:
+        json.dump(config, f)
+    mtime = os.stat(config_path).st_mtime_ns + 1_000_000_000
+    os.utime(config_path, ns=(mtime, mtime))
+
+    after = calendar.generate_calendar(START, END)
+    assert len(trading_logic._CLASS_OVERLAYS) == 2
+    assert set(after['recommendation']) == {'CLOSED', 'TRADE'}
+    assert not after['recommendation'].equals(before['recommendation'])
+
+
+def test_returned_frame_is_independent_of_caches(config_path):
+    calendar = TradingCalendar(MUMBAI, config_path)
+    df = calendar.generate_calendar(START, END)
+    expected = df.copy()
+
+    df.loc[0, 'pada'] = 4 if df.loc[0, 'pada'] != 4 else 1
+    df.loc[1, 'nakshatra'] = 'Revati' if df.loc[1, 'nakshatra'] != 'Revati' else 'Ashwini'
+    df.loc[2, 'recommendation'] = 'CLOSED' if df.loc[2, 'recommendation'] != 'CLOSED' else 'TRADE'
+    df['ashtama_moon'] = True
+    df['change_during_market'] = ~df['change_during_market']
+    df.drop(columns='reasons', inplace=True)
+
+    assert calendar.generate_calendar(START, END).equals(expected)
+    assert TradingCalendar(KOLKATA, calendar.config_path).generate_calendar(START, END)['nakshatra'].equals(expected['nakshatra'])
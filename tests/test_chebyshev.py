@@ -0,0 +1,36 @@
+"""
+Chebyshev fits against swisseph, including the rounded-up tail of each span
+"""
+import numpy as np
+import swisseph as swe
+from core.astro_engine import AstroCalculator
+
+J0 = 2460310.5  # 2024-01-01
+
+
+def _max_error(calc, body, jds):
+    """Largest fitted-vs-swisseph sidereal longitude difference in degrees"""
+    planet = swe.MOON if body == 'Moon' else swe.SUN
+    errors = []
+    for jd in jds:
+        with calc.ephemeris():
+            expected = swe.calc_ut(jd, planet, swe.FLG_SIDEREAL)[0][0]
+        errors.append(abs((calc.interpolated[body].longitude_at(jd) - expected + 180) % 360 - 180))
+    return max(errors)
+
+
+def test_fit_is_accurate_up_to_rounded_end():
+    calc = AstroCalculator(almanac_path=None)
+    calc.prepare_range(J0, J0 + 100)
+    for body in ['Sun', 'Moon']:
+        series = calc.interpolated[body]
+        assert _max_error(calc, body, np.linspace(J0, series.jd_end, 300)) < 1e-6
+
+
+def test_refit_inside_cached_tropical_span():
+    calc = AstroCalculator(almanac_path=None)
+    calc.prepare_range(J0, J0 + 100)
+    calc.prepare_range(J0 + 3, J0 + 99.5)
+    series = calc.interpolated['Moon']
+    assert series.covers([J0 + 102.9])
+    assert _max_error(calc, 'Moon', np.linspace(J0 + 3, series.jd_end, 300)) < 1e-6
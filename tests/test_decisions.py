@@ -0,0 +1,49 @@
+"""
+Vectorized calendar decisions against the reference decision function
+"""
+from core.trading_logic import TradingCalendar
+
+PROFILES = [
+    {"dob": "1983-11-21", "tob": "05:50", "lat": 28.661, "lon": 77.133, "lagna": "Libra"},
+    {"dob": "1990-04-02", "tob": "22:10", "lat": 19.076, "lon": 72.878},
+    {"dob": "1975-08-15", "tob": "12:00"}
+]
+
+
+def _holidays_file(tmp_path):
+    path = tmp_path / 'holidays.csv'
+    path.write_text(
+        "date,description\n"
+        "2024-01-26,Republic Day\n"
+        "2024-03-25,Holi\n"
+        "2024-08-15,Independence Day\n"
+        "2025-10-02,Gandhi Jayanti\n"
+    )
+    return str(path)
+
+
+def _assert_rows_match_reference(calendar, df):
+    assert len(df)
+    for row in df.to_dict('records'):
+        retrogrades = [] if row['retrogrades'] == 'None' else row['retrogrades'].split(', ')
+        expected = calendar._get_trading_decision(
+            row['navatara'], row['ashtama_moon'], row['ashtama_lagna'],
+            row['change_during_market'], row['moon_phase'], retrogrades,
+            row['is_holiday'], row['date'].weekday() >= 5
+        )
+        assert (row['recommendation'], row['reasons'].split(' | ')) == expected, row['date']
+
+
+def test_calendar_decisions_match_reference(config_path, tmp_path):
+    holidays_path = _holidays_file(tmp_path)
+    for profile in PROFILES:
+        calendar = TradingCalendar(profile, config_path, holidays_path)
+        df = calendar.generate_calendar('2024-01-01', '2025-12-31')
+        assert df['is_holiday'].sum() == 4
+        _assert_rows_match_reference(calendar, df)
+
+
+def test_apply_rules_matches_generated(config_path, profile):
+    calendar = TradingCalendar(profile, config_path)
+    df = calendar.generate_calendar('2024-01-01', '2024-06-30')
+    assert calendar.apply_rules(df).equals(df)
@@ -0,0 +1,61 @@
+"""
+Merged intraday event stream against the per-kind lookups
+"""
+from datetime import date, datetime, timedelta
+from itertools import islice
+import pytest
+from core import astro_engine
+from core.astro_engine import AstroCalculator, EVENT_KINDS
+
+DAY = date(2024, 3, 14)
+MUMBAI = (19.076, 72.878)
+J0 = 2460310  # 2024-01-01 12:00 UT, as an int
+
+
+@pytest.fixture
+def calc(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    return AstroCalculator(almanac_path=None)
+
+
+def _midnight(day):
+    return datetime.combine(day, datetime.min.time())
+
+
+def test_events_are_time_ordered_and_cover_every_kind(calc):
+    events = list(calc.iter_events(_midnight(DAY), _midnight(DAY + timedelta(days=3)), lat=MUMBAI[0], lon=MUMBAI[1]))
+    assert [e.jd for e in events] == sorted(e.jd for e in events)
+    assert {e.kind for e in events} == set(EVENT_KINDS)
+
+
+@pytest.mark.parametrize('kind', ['nakshatra', 'pada', 'tithi', 'yoga', 'moon_sign'])
+def test_boundary_events_match_find_change_times(calc, kind):
+    for day in [DAY, DAY + timedelta(days=1), date(2020, 1, 19)]:
+        events = calc.iter_events(_midnight(day), _midnight(day + timedelta(days=1)), kinds=[kind])
+        assert [(e.time, e.index) for e in events] == calc.find_change_times(kind, day)
+
+
+def test_hora_events_match_hora_sequence(calc):
+    sequence = calc.get_hora_sequence(DAY, *MUMBAI)
+    events = list(calc.iter_events(sequence[0]['start_jd'], sequence[-1]['end_jd'], kinds=['hora'],
+                                   lat=MUMBAI[0], lon=MUMBAI[1]))
+    assert [(e.jd, e.time, e.name) for e in events] == [(h['start_jd'], h['start'], h['lord']) for h in sequence]
+
+    # Without a location there are no hora events
+    assert list(calc.iter_events(_midnight(DAY), _midnight(DAY + timedelta(days=1)), kinds=['hora'])) == []
+
+
+def test_open_ended_stream_is_lazy(calc, monkeypatch):
+    windows = []
+    find_boundaries = calc.find_boundaries
+
+    def recording(kind, jd_start, jd_end):
+        windows.append(jd_end)
+        return find_boundaries(kind, jd_start, jd_end)
+
+    monkeypatch.setattr(calc, 'find_boundaries', recording)
+
+    events = list(islice(calc.iter_events(J0, lat=MUMBAI[0], lon=MUMBAI[1]), 40))
+    assert len(events) == 40
+    assert max(windows) < J0 + 5  # only the first days were solved
+    assert events == list(calc.iter_events(float(J0), events[-1].jd + 1e-9, lat=MUMBAI[0], lon=MUMBAI[1]))
@@ -0,0 +1,52 @@
+"""
+Holidays and special sessions in the calendar overlay
+"""
+from datetime import date
+from core.trading_logic import TradingCalendar
+
+HOLIDAYS_CSV = (
+    "date,description,session_start,session_end\n"
+    "2024-01-26,Republic Day,,\n"
+    "2024-11-01,Diwali Laxmi Pujan,,\n"
+    "2024-11-01,Muhurat Trading,18:00,19:00\n"
+    "2023-11-12,Muhurat Trading,18:15,19:15\n"
+)
+
+
+def _calendar(config_path, profile, tmp_path):
+    path = tmp_path / 'holidays.csv'
+    path.write_text(HOLIDAYS_CSV)
+    return TradingCalendar(profile, config_path, str(path))
+
+
+def _day(df, day):
+    return df[df['date'] == day].iloc[0]
+
+
+def test_holiday_is_closed(config_path, profile, tmp_path):
+    df = _calendar(config_path, profile, tmp_path).generate_calendar('2024-01-20', '2024-01-31')
+    row = _day(df, date(2024, 1, 26))
+    assert row['is_holiday']
+    assert row['holiday_name'] == 'Republic Day'
+    assert row['recommendation'] == 'CLOSED'
+    assert row['reasons'] == 'Market Holiday'
+
+
+def test_muhurat_session_on_holiday_opens_the_day(config_path, profile, tmp_path):
+    calendar = _calendar(config_path, profile, tmp_path)
+    df = calendar.generate_calendar('2024-10-28', '2024-11-08')
+    row = _day(df, date(2024, 11, 1))
+    assert not row['is_holiday']
+    assert row['holiday_name'] == 'Muhurat Trading 18:00-19:00'
+    assert row['recommendation'] != 'CLOSED'
+    assert calendar._get_holiday_name(date(2024, 11, 1)) == 'Muhurat Trading 18:00-19:00'
+
+
+def test_muhurat_session_on_sunday_opens_the_day(config_path, profile, tmp_path):
+    calendar = _calendar(config_path, profile, tmp_path)
+    df = calendar.generate_calendar('2023-11-06', '2023-11-19')
+    row = _day(df, date(2023, 11, 12))
+    assert row['holiday_name'] == 'Muhurat Trading 18:15-19:15'
+    assert row['recommendation'] != 'CLOSED'
+    assert _day(df, date(2023, 11, 19))['reasons'] == 'Weekend'
+    assert calendar.apply_rules(df).equals(df)
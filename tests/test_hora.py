@@ -0,0 +1,95 @@
+"""
+True-sunrise hora against one derived from swe.rise_trans
+"""
+from datetime import datetime, timedelta
+import pytest
+import pytz
+import swisseph as swe
+from core.astro_engine import AstroCalculator
+
+MUMBAI = (19.076, 72.878)
+SVALBARD = (78.223, 15.647)  # midnight sun in June
+
+# Planetary hour order; each hora's lord is the next one down the list
+CHALDEAN = ['Saturn', 'Jupiter', 'Mars', 'Sun', 'Venus', 'Mercury', 'Moon']
+WEEKDAY_LORDS = ['Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Sun']
+
+
+def _jd(dt, tz='Asia/Kolkata'):
+    utc = pytz.timezone(tz).localize(dt).astimezone(pytz.UTC)
+    return swe.julday(utc.year, utc.month, utc.day, utc.hour + utc.minute / 60.0 + utc.second / 3600.0)
+
+
+def _sun_event(calc, day, lat, lon, event):
+    with calc.ephemeris():
+        return swe.rise_trans(_jd(datetime.combine(day, datetime.min.time())), swe.SUN, event, (lon, lat, 0.0))[1][0]
+
+
+def _reference_hora(calc, dt, lat, lon):
+    """(lord, day lord) with 12 day horas from sunrise and 12 night horas from sunset"""
+    jd = _jd(dt)
+    day = dt.date()
+    if jd < _sun_event(calc, day, lat, lon, swe.CALC_RISE):
+        day -= timedelta(days=1)
+
+    sunrise = _sun_event(calc, day, lat, lon, swe.CALC_RISE)
+    sunset = _sun_event(calc, day, lat, lon, swe.CALC_SET)
+    next_sunrise = _sun_event(calc, day + timedelta(days=1), lat, lon, swe.CALC_RISE)
+    if jd < sunset:
+        number = int((jd - sunrise) / ((sunset - sunrise) / 12.0))
+    else:
+        number = 12 + int((jd - sunset) / ((next_sunrise - sunset) / 12.0))
+
+    day_lord = WEEKDAY_LORDS[day.weekday()]
+    return CHALDEAN[(CHALDEAN.index(day_lord) + number) % 7], day_lord
+
+
+@pytest.mark.parametrize('dt', [
+    datetime(2024, 3, 14, 7, 0),
+    datetime(2024, 3, 14, 9, 15),
+    datetime(2024, 3, 14, 12, 40),
+    datetime(2024, 3, 14, 19, 5),
+    datetime(2024, 3, 14, 23, 50),
+    datetime(2024, 6, 21, 13, 0)
+])
+def test_hora_matches_rise_trans(dt):
+    calc = AstroCalculator(almanac_path=None)
+    hora = calc.get_hora(dt, *MUMBAI)
+    assert (hora['lord'], hora['day_lord']) == _reference_hora(calc, dt, *MUMBAI)
+
+
+def test_hour_before_sunrise_belongs_to_previous_vedic_day():
+    calc = AstroCalculator(almanac_path=None)
+    dt = datetime(2024, 3, 14, 5, 0)  # Thursday, before a ~06:45 sunrise
+    hora = calc.get_hora(dt, *MUMBAI)
+    assert hora['day_lord'] == 'Mercury'  # Wednesday
+    assert (hora['lord'], hora['day_lord']) == _reference_hora(calc, dt, *MUMBAI)
+
+    # The same instant is a night hora of Wednesday's sequence
+    sequence = calc.get_hora_sequence(dt.date() - timedelta(days=1), *MUMBAI)
+    current = [h for h in sequence if h['start_jd'] <= _jd(dt) < h['end_jd']]
+    assert [h['lord'] for h in current] == [hora['lord']]
+    assert current[0]['number'] > 12
+
+
+@pytest.mark.parametrize('lat, lon', [(None, None), SVALBARD])
+def test_fixed_six_am_fallback(lat, lon):
+    calc = AstroCalculator(almanac_path=None)
+    dt = datetime(2024, 6, 20, 6, 30)  # Thursday, in the first hora after 6 AM
+    hora = calc.get_hora(dt, lat, lon)
+    assert hora == calc._get_hora_fixed(dt)
+    assert hora == {'lord': 'Jupiter', 'day_lord': 'Jupiter'}
+    if lat is not None:
+        assert calc.get_sun_times(dt.date(), lat, lon) is None
+        assert calc.get_hora_sequence(dt.date(), lat, lon) is None
+
+
+def test_fill_sun_times_matches_single_days():
+    calc = AstroCalculator(almanac_path=None)
+    start = datetime(2024, 3, 1).date()
+    calc.fill_sun_times(start, start + timedelta(days=9), *MUMBAI)
+    for i in range(10):
+        day = start + timedelta(days=i)
+        sunrise, sunset = calc.get_sun_times(day, *MUMBAI)
+        assert sunrise == pytest.approx(_sun_event(calc, day, *MUMBAI, swe.CALC_RISE), abs=1e-8)
+        assert sunset == pytest.approx(_sun_event(calc, day, *MUMBAI, swe.CALC_SET), abs=1e-8)
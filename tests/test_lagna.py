@@ -0,0 +1,65 @@
+"""
+Intraday lagna timeline against swe.houses
+"""
+from datetime import date, time
+import numpy as np
+import pytest
+import swisseph as swe
+from core.astro_engine import AstroCalculator, BOUNDARY_TOLERANCE
+from core.timezones import julian_days
+
+DAY = date(2024, 3, 14)
+
+CITIES = [
+    ('Mumbai', 19.076, 72.878, 'Asia/Kolkata'),
+    ('Delhi', 28.661, 77.133, 'Asia/Kolkata'),
+    ('London', 51.507, -0.128, 'Europe/London'),
+    ('Sydney', -33.869, 151.209, 'Australia/Sydney'),
+    ('New York', 40.713, -74.006, 'America/New_York')
+]
+
+TOLERANCE = 1e-4  # degrees
+
+
+def _ascendant(calc, jd, lat, lon):
+    """Sidereal ascendant straight from swe.houses"""
+    with calc.ephemeris():
+        asc = swe.houses(jd, lat, lon, b'P')[1][0]
+        return (asc - swe.get_ayanamsa_ut(jd)) % 360
+
+
+def _difference(a, b):
+    return abs((a - b + 180.0) % 360.0 - 180.0)
+
+
+@pytest.mark.parametrize('name, lat, lon, tz', CITIES)
+def test_ascendants_match_swe_houses(name, lat, lon, tz):
+    calc = AstroCalculator(almanac_path=None)
+    timeline = calc.get_lagna_timeline(DAY, lat, lon, tz=tz)
+    jd_start, jd_end = timeline[0]['start_jd'], timeline[-1]['end_jd']
+
+    jds = np.linspace(jd_start, jd_end, 40)
+    ascendants = calc._ascendants(jds, jd_start, lat, lon)
+    assert max(_difference(a, _ascendant(calc, jd, lat, lon)) for jd, a in zip(jds.tolist(), ascendants.tolist())) < TOLERANCE
+
+
+@pytest.mark.parametrize('name, lat, lon, tz', CITIES)
+def test_timeline_signs_and_change_times(name, lat, lon, tz):
+    calc = AstroCalculator(almanac_path=None)
+    timeline = calc.get_lagna_timeline(DAY, lat, lon, tz=tz)
+    assert len(timeline) >= 2
+    session = julian_days([DAY], time(9, 15), tz)[0], julian_days([DAY], time(15, 30), tz)[0]
+    assert (timeline[0]['start_jd'], timeline[-1]['end_jd']) == pytest.approx(session, abs=1e-9)
+
+    for segment, following in zip(timeline, timeline[1:]):
+        assert segment['end_jd'] == following['start_jd']
+        assert following['sign_index'] == (segment['sign_index'] + 1) % 12
+        # Change times are bisected to BOUNDARY_TOLERANCE
+        change = following['start_jd']
+        assert int(_ascendant(calc, change - 2 * BOUNDARY_TOLERANCE, lat, lon) // 30) == segment['sign_index']
+        assert int(_ascendant(calc, change, lat, lon) // 30) == following['sign_index']
+
+    for segment in timeline:
+        middle = (segment['start_jd'] + segment['end_jd']) / 2.0
+        assert int(_ascendant(calc, middle, lat, lon) // 30) == segment['sign_index']
+        assert segment['sign'] == calc.zodiac_signs[segment['sign_index']]
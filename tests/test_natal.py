@@ -0,0 +1,37 @@
+"""
+Shared NatalChart instances cannot be changed by one caller for another
+"""
+import copy
+import pickle
+import pytest
+from core.astro_engine import get_natal_chart
+from core.trading_logic import TradingCalendar
+
+
+def test_natal_chart_is_immutable():
+    chart = get_natal_chart('1983-11-21', '05:50', 28.661, 77.133)
+    with pytest.raises(AttributeError):
+        chart.lagna = 'Aries'
+    with pytest.raises(AttributeError):
+        del chart.moon_sign
+    with pytest.raises(TypeError):
+        chart.moon_nakshatra['index'] = 0
+    with pytest.raises(TypeError):
+        chart.positions['Moon'] = 0.0
+
+
+def test_natal_chart_is_a_value():
+    chart = get_natal_chart('1983-11-21', '05:50', 28.661, 77.133)
+    assert get_natal_chart('1983-11-21', '05:50', 28.661, 77.133) is chart
+    assert pickle.loads(pickle.dumps(chart)) == chart
+    assert copy.deepcopy(chart) == chart
+    assert hash(copy.copy(chart)) == hash(chart)
+    assert chart != get_natal_chart('1983-11-21', '05:51', 28.661, 77.133)
+
+
+def test_calendar_cannot_corrupt_shared_chart(config_path, profile):
+    calendar = TradingCalendar(profile, config_path)
+    index = calendar.birth_nakshatra['index']
+    with pytest.raises(TypeError):
+        calendar.birth_nakshatra['index'] = (index + 1) % 27
+    assert TradingCalendar(profile, config_path).birth_nakshatra['index'] == index
@@ -0,0 +1,120 @@
+"""
+Compiled trading rules against the plain-Python reference decision
+"""
+import itertools
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from core.rules import RuleSet, get_rules
+from core.trading_logic import TradingCalendar, NAVATARA_NAMES, RETROGRADE_NAMES
+
+MOON_PHASES = ['New Moon', 'Waxing Crescent', 'Full Moon', 'Waning Gibbous']
+
+INPUTS = list(itertools.product(
+    NAVATARA_NAMES, [False, True], [False, True], [False, True],
+    MOON_PHASES, RETROGRADE_NAMES, [False, True], [False, True]
+))
+
+
+def _decide(rules):
+    """RuleSet decisions and reasons over every input combination"""
+    names = ['navatara', 'ashtama_moon', 'ashtama_lagna', 'change_during_market',
+             'moon_phase', 'retrogrades', 'is_holiday', 'is_weekend']
+    columns = {name: np.array(values, dtype=object) for name, values in zip(names, zip(*INPUTS))}
+    return rules.evaluate(columns)
+
+
+def _reference(calendar):
+    """Reference decisions and ' | '-joined reasons over every combination"""
+    results = []
+    for values in INPUTS:
+        values = list(values)
+        values[5] = [] if values[5] == 'None' else values[5].split(', ')
+        recommendation, reasons = calendar._get_trading_decision(*values)
+        results.append((recommendation, ' | '.join(reasons)))
+    return results
+
+
+def _assert_matches(rules, expected):
+    recommendations, reasons = _decide(rules)
+    assert list(zip(recommendations, reasons)) == expected
+
+
+def test_default_rules_match_reference(config_path, profile):
+    calendar = TradingCalendar(profile, config_path)
+    _assert_matches(RuleSet({}), _reference(calendar))
+
+
+def test_configured_rules_match_reference(config_path, profile):
+    calendar = TradingCalendar(profile, config_path)
+    with open('config.json') as f:
+        trading_rules = json.load(f)['trading_rules']
+    assert 'rules' in trading_rules
+    _assert_matches(RuleSet(trading_rules), _reference(calendar))
+    _assert_matches(calendar.get_rules(), _reference(calendar))
+
+
+def test_list_rule_on_categorical_matches_object_column():
+    rules = RuleSet({'rules': [
+        {'when': 'retrogrades', 'in': ['Jupiter', 'Saturn'], 'then': 'LIGHT', 'reason': 'Slow retrograde'}
+    ]})
+    names = RETROGRADE_NAMES * 3
+    expected = [any(p in name.split(', ') for p in ['Jupiter', 'Saturn']) for name in names]
+
+    for column in [np.array(names, dtype=object), pd.Categorical(names, categories=RETROGRADE_NAMES)]:
+        recommendations, _ = rules.evaluate({'navatara': ['Janma'] * len(names), 'retrogrades': column})
+        assert [r == 'LIGHT' for r in recommendations] == expected
+
+
+def test_rule_without_in_must_test_a_flag_column():
+    for column in ['retrogrades', 'moon_phase', 'navatara', 'tithi']:
+        with pytest.raises(ValueError, match=column):
+            RuleSet({'rules': [{'when': column, 'then': 'LIGHT'}]})
+
+    rules = RuleSet({'rules': [{'when': 'ashtama_moon', 'then': 'AVOID'}]})
+    recommendations, _ = rules.evaluate({'navatara': ['Janma'] * 2, 'ashtama_moon': [True, False]})
+    assert list(recommendations) == ['AVOID', 'TRADE']
+
+
+def _edit(path, text, step):
+    """Rewrite a file with a distinct modification time"""
+    with open(path, 'w') as f:
+        f.write(text)
+    mtime = os.stat(path).st_mtime_ns + step * 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_config_edits_reload_and_bad_edits_keep_last_rules(config_path, profile):
+    calendar = TradingCalendar(profile, config_path)
+    with open(config_path) as f:
+        config = json.load(f)
+    original = get_rules(config_path)
+
+    config['trading_rules']['rules'] = [{'when': 'is_weekend', 'then': 'CLOSED', 'reason': 'Weekend'}]
+    _edit(config_path, json.dumps(config), 1)
+    edited = get_rules(config_path)
+    assert edited is not original and len(edited.rules) == 1
+
+    # Half-saved file, then a rule that does not compile
+    for step, text in enumerate(['{"trading_rules": ', json.dumps({'trading_rules': {'rules': [{'when': 'tithi', 'then': 'LIGHT'}]}})], 2):
+        _edit(config_path, text, step)
+        with pytest.warns(UserWarning, match='Keeping previous trading rules'):
+            assert get_rules(config_path) is edited
+        assert get_rules(config_path) is edited
+        df = calendar.generate_calendar('2024-01-01', '2024-01-07')
+        assert set(df['recommendation']) <= {'CLOSED', 'TRADE'}
+
+    _edit(config_path, json.dumps({'trading_rules': {}}), 5)
+    assert get_rules(config_path).key == RuleSet({}).key
+
+
+def test_empty_rules_give_the_default_everywhere():
+    rules = RuleSet({'rules': [], 'default': {'then': 'LIGHT', 'reason': 'No rules: {navatara}'}})
+    recommendations, reasons = rules.evaluate({'navatara': np.array(['Janma', 'Vipat', 'Janma'], dtype=object)})
+    assert list(recommendations) == ['LIGHT'] * 3
+    assert list(reasons) == ['No rules: Janma', 'No rules: Vipat', 'No rules: Janma']
+
+    recommendations, reasons = rules.evaluate({'navatara': np.array([], dtype=object)})
+    assert len(recommendations) == len(reasons) == 0
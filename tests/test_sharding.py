@@ -0,0 +1,19 @@
+"""
+Sky calendars sharded across worker processes against the serial build
+"""
+from core import trading_logic
+from core.trading_logic import TradingCalendar
+
+
+def test_sharded_calendar_matches_serial(config_path, profile, monkeypatch):
+    calendar = TradingCalendar(profile, config_path)
+
+    monkeypatch.setattr(trading_logic, '_SKY_CALENDARS', {})
+    serial = calendar.generate_calendar('2023-01-01', '2024-12-31', workers=1)
+
+    # Uneven shards: 731 days is not a multiple of 97
+    monkeypatch.setattr(trading_logic, '_SKY_CALENDARS', {})
+    sharded = calendar.generate_calendar('2023-01-01', '2024-12-31', workers=3, shard_days=97)
+
+    assert len(sharded) == 731
+    assert sharded.equals(serial)
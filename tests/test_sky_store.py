@@ -0,0 +1,69 @@
+"""
+Calendars read through the persistent sky store against ones computed directly
+"""
+import json
+import sqlite3
+from core import sky_store, trading_logic
+from core.sky_store import SKY_COLUMNS, SkyCalendarStore
+from core.trading_logic import TradingCalendar
+
+
+def _store_config(config_path, tmp_path):
+    with open(config_path) as f:
+        config = json.load(f)
+    config['sky_store_path'] = str(tmp_path / 'sky.sqlite')
+    path = tmp_path / 'store_config.json'
+    path.write_text(json.dumps(config))
+    return str(path), config['sky_store_path']
+
+
+def _generate(calendar, start, end, monkeypatch):
+    """Calendar for a range, bypassing the in-memory sky cache"""
+    monkeypatch.setattr(trading_logic, '_SKY_CALENDARS', {})
+    return calendar.generate_calendar(start, end)
+
+
+def test_store_fresh_extended_and_gap_filled(config_path, profile, tmp_path, monkeypatch):
+    direct = TradingCalendar(profile, config_path)
+    store_config, store_path = _store_config(config_path, tmp_path)
+    stored = TradingCalendar(profile, store_config)
+    assert stored.sky_store is not None
+
+    # Fresh store
+    assert _generate(stored, '2024-01-01', '2024-01-31', monkeypatch).equals(
+        _generate(direct, '2024-01-01', '2024-01-31', monkeypatch))
+
+    # Extended past the stored days
+    assert _generate(stored, '2024-01-01', '2024-03-31', monkeypatch).equals(
+        _generate(direct, '2024-01-01', '2024-03-31', monkeypatch))
+
+    # A gap between stored runs
+    _generate(stored, '2024-06-01', '2024-06-30', monkeypatch)
+    assert _generate(stored, '2024-03-15', '2024-06-30', monkeypatch).equals(
+        _generate(direct, '2024-03-15', '2024-06-30', monkeypatch))
+
+    # Everything requested is now stored, and read back unchanged
+    days = SkyCalendarStore(store_path).load(stored.astro_calc.ayanamsha,
+                                             trading_logic._as_date('2024-01-01'),
+                                             trading_logic._as_date('2024-06-30'))
+    assert len(days) == 182
+    assert _generate(stored, '2024-01-01', '2024-06-30', monkeypatch).equals(
+        _generate(direct, '2024-01-01', '2024-06-30', monkeypatch))
+
+
+def test_store_with_older_layout_is_rebuilt(config_path, profile, tmp_path, monkeypatch):
+    store_config, store_path = _store_config(config_path, tmp_path)
+    with sqlite3.connect(store_path) as conn:
+        conn.execute('CREATE TABLE sky_days (ayanamsha TEXT, engine_version INTEGER, date TEXT, tithi TEXT)')
+        conn.execute("INSERT INTO sky_days VALUES ('LAHIRI', 1, '2024-01-01', 'Shukla Pratipada')")
+
+    monkeypatch.setattr(sky_store, '_STORES', {})
+    stored = TradingCalendar(profile, store_config)
+    direct = TradingCalendar(profile, config_path)
+    assert _generate(stored, '2024-01-01', '2024-01-10', monkeypatch).equals(
+        _generate(direct, '2024-01-01', '2024-01-10', monkeypatch))
+
+    days = SkyCalendarStore(store_path).load('LAHIRI', trading_logic._as_date('2024-01-01'),
+                                             trading_logic._as_date('2024-01-10'))
+    assert list(days.columns) == SKY_COLUMNS
+    assert days['tithi_index'].between(0, 29).all()
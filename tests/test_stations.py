@@ -0,0 +1,47 @@
+"""
+Retrograde station lookups beyond the span a calendar indexed
+"""
+import pytest
+import swisseph as swe
+from core import astro_engine
+from core.astro_engine import AstroCalculator, PLANET_IDS
+
+J0 = 2460310.5  # 2024-01-01
+
+
+def _speed(calc, jd, planet):
+    with calc.ephemeris():
+        return swe.calc_ut(jd, PLANET_IDS[planet], swe.FLG_SIDEREAL | swe.FLG_SPEED)[0][3]
+
+
+def test_next_station_after_indexed_span(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    expected = AstroCalculator(almanac_path=None).days_until_station(J0, 'Saturn')
+
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    calc = AstroCalculator(almanac_path=None)
+    calc.build_station_index(J0 - 30, J0 + 30)
+    days = calc.days_until_station(J0, 'Saturn')
+
+    assert expected is not None and expected > 30
+    assert days is not None
+    assert abs(days - expected) < 1e-3  # stations are solved to a speed tolerance
+
+
+@pytest.mark.parametrize('planet, jd, expected', [
+    ('Mars', 2460735.5, 2461416),   # from 2025-03-01, a ~680-day direct spell
+    ('Venus', J0, 2460736),         # from 2024-01-01
+    ('Venus', 2460796.5, None)      # from 2025-05-01
+])
+def test_next_station_of_slow_stationing_planets(monkeypatch, planet, jd, expected):
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    calc = AstroCalculator(almanac_path=None)
+    station = calc.get_next_station(jd, planet)
+
+    assert station is not None
+    station_jd, becomes_retrograde = station
+    assert station_jd > jd
+    if expected is not None:
+        assert abs(station_jd - expected) < 1.0
+    assert (_speed(calc, station_jd + 1, planet) < 0) == becomes_retrograde
+    assert (_speed(calc, station_jd - 1, planet) < 0) != becomes_retrograde
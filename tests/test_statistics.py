@@ -0,0 +1,56 @@
+"""
+Incremental calendar statistics against per-value filtering of the whole frame
+"""
+from datetime import date
+import pytest
+from core.statistics import CalendarStatistics
+from core.trading_logic import TradingCalendar
+
+
+def _filtered_statistics(df):
+    """Statistics by filtering the whole frame once per value"""
+    df = df.astype(object)
+    stats = {
+        'total_days': len(df),
+        'trade_days': len(df[df['recommendation'] == 'TRADE']),
+        'light_days': len(df[df['recommendation'] == 'LIGHT']),
+        'avoid_days': len(df[df['recommendation'] == 'AVOID']),
+        'closed_days': len(df[df['recommendation'] == 'CLOSED']),
+        'nakshatra_changes_market': len(df[df['change_during_market'] == True])
+    }
+    by_navatara = df.groupby('navatara')['recommendation'].value_counts().unstack(fill_value=0).to_dict() if len(df) else {}
+    return {
+        'summary': stats,
+        'navatara_distribution': df['navatara'].value_counts().to_dict(),
+        'recommendations_by_navatara': by_navatara
+    }
+
+
+@pytest.mark.parametrize('start, end, split', [
+    ('2024-01-01', '2024-06-30', '2024-04-01'),
+    ('2024-01-06', '2024-01-07', '2024-01-07'),  # a weekend only
+])
+def test_incremental_statistics_match_filtering(config_path, profile, start, end, split):
+    calendar = TradingCalendar(profile, config_path)
+    df = calendar.generate_calendar(start, end)
+    expected = _filtered_statistics(df)
+    closed = sum(d.weekday() >= 5 or holiday for d, holiday in zip(df['date'], df['is_holiday']))
+    assert expected['summary']['closed_days'] == closed > 0
+
+    assert CalendarStatistics(df).to_dict() == expected
+    assert calendar.get_statistics(df) == expected
+
+    # A frame for the first part, then one record at a time
+    head = df[df['date'] < date.fromisoformat(split)]
+    stats = CalendarStatistics().update(head)
+    for day in calendar.iter_calendar(split, end):
+        stats.add(day)
+    assert stats.to_dict() == expected
+
+
+def test_empty_calendar(config_path, profile):
+    df = TradingCalendar(profile, config_path).generate_calendar('2024-01-01', '2024-01-31').iloc[0:0]
+    expected = _filtered_statistics(df)
+    assert expected['summary']['total_days'] == 0
+    assert CalendarStatistics(df).to_dict() == expected
+    assert CalendarStatistics().update(df).to_dict() == CalendarStatistics().to_dict() == expected
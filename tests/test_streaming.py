@@ -0,0 +1,46 @@
+"""
+Streamed calendar days and CSV against the whole-range calendar
+"""
+import csv
+from itertools import islice
+import pandas as pd
+from core import trading_logic
+from core.reports import ReportGenerator
+from core.trading_logic import CALENDAR_COLUMNS, CalendarDay, TradingCalendar
+
+START, END = '2024-01-01', '2024-02-14'
+
+
+def _frame(days):
+    return pd.DataFrame([day._asdict() for day in days], columns=CALENDAR_COLUMNS)
+
+
+def test_iter_calendar_rebuilds_generated_frame(config_path, profile, monkeypatch):
+    calendar = TradingCalendar(profile, config_path)
+    expected = calendar.generate_calendar(START, END).astype(object)
+
+    # 45 days in chunks of 10, so four chunk boundaries are crossed
+    monkeypatch.setattr(trading_logic, '_SKY_CALENDARS', {})
+    days = list(calendar.iter_calendar(START, END, chunk_days=10))
+    assert all(isinstance(day, CalendarDay) for day in days)
+    assert days[3]['nakshatra'] == days[3].nakshatra
+    assert _frame(days).astype(object).equals(expected)
+    assert trading_logic._SKY_CALENDARS == {}
+
+    # Open-ended, read through islice
+    days = list(islice(calendar.iter_calendar(START, chunk_days=10), len(expected)))
+    assert _frame(days).astype(object).equals(expected)
+
+
+def test_stream_csv_matches_generate_csv(config_path, profile, tmp_path):
+    calendar = TradingCalendar(profile, config_path)
+    reports = ReportGenerator()
+    reports.generate_csv(calendar.generate_calendar(START, END), str(tmp_path / 'frame.csv'))
+    reports.stream_csv(calendar.iter_calendar(START, END, chunk_days=10), str(tmp_path / 'stream.csv'))
+
+    def rows(name):
+        with open(tmp_path / name, newline='') as f:
+            return list(csv.reader(f))
+
+    assert len(rows('frame.csv')) == 46
+    assert rows('stream.csv') == rows('frame.csv')
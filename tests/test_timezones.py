@@ -0,0 +1,60 @@
+"""
+Cached-offset Julian Day conversion against pytz localize()
+"""
+from datetime import date, datetime, time, timedelta
+import numpy as np
+import pytest
+import pytz
+import swisseph as swe
+from core.astro_engine import AstroCalculator
+from core.timezones import julian_days
+
+TOLERANCE = 1e-6  # days, ~0.1 seconds
+
+
+def _pytz_jd(day, wall_time, tz):
+    """Julian Day (UT) of a wall-clock time, localized by pytz"""
+    local = pytz.timezone(tz).localize(datetime.combine(day, wall_time))
+    utc = local.astimezone(pytz.UTC)
+    return swe.julday(utc.year, utc.month, utc.day, utc.hour + utc.minute / 60.0 + utc.second / 3600.0)
+
+
+def _days(start, end, step):
+    days = []
+    while start <= end:
+        days.append(start)
+        start += timedelta(days=step)
+    return days
+
+
+# Every 13 days from 1850 to 2030, and every day of the 1942-45 war time
+KOLKATA_DAYS = _days(date(1850, 1, 1), date(2030, 12, 31), 13) + _days(date(1941, 9, 1), date(1945, 12, 31), 1)
+
+# Noon is never skipped or repeated by a DST change
+DST_DAYS = _days(date(1900, 1, 1), date(2030, 12, 31), 5)
+
+
+@pytest.mark.parametrize('tz, days, wall_time', [
+    ('Asia/Kolkata', KOLKATA_DAYS, time(9, 15)),
+    ('Asia/Kolkata', KOLKATA_DAYS, time(0, 0)),
+    ('America/New_York', DST_DAYS, time(12, 0)),
+    ('Europe/London', DST_DAYS, time(12, 30))
+])
+def test_julian_days_match_pytz(tz, days, wall_time):
+    expected = np.array([_pytz_jd(day, wall_time, tz) for day in days])
+    assert np.abs(julian_days(days, wall_time, tz) - expected).max() < TOLERANCE
+
+
+@pytest.mark.parametrize('tz, days', [
+    ('Asia/Kolkata', KOLKATA_DAYS[::7]),
+    ('America/New_York', DST_DAYS[::7])
+])
+def test_get_julian_day_matches_pytz(tz, days):
+    calc = AstroCalculator(almanac_path=None)
+    wall_time = time(14, 45, 30)
+    for day in days:
+        expected = _pytz_jd(day, wall_time, tz)
+        naive = datetime.combine(day, wall_time)
+        aware = pytz.timezone(tz).localize(naive)
+        assert abs(calc.get_julian_day(naive, tz) - expected) < TOLERANCE, day
+        assert abs(calc.get_julian_day(aware) - expected) < TOLERANCE, day
@@ -0,0 +1,61 @@
+"""
+Shared transition and station indexes over separate, distant windows
+"""
+from core import astro_engine
+from core.astro_engine import AstroCalculator
+
+J2024 = 2460310.5  # 2024-01-01
+J1960 = 2436934.5  # 1960-01-01
+
+
+def _record_calls(monkeypatch, calc, method):
+    """Arguments of every call to a calculator method, as tuples"""
+    calls = []
+    original = getattr(calc, method)
+
+    def recording(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(calc, method, recording)
+    return calls
+
+
+def test_distant_window_gets_its_own_transition_index(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    calc = AstroCalculator(almanac_path=None)
+    recent = calc.build_transition_index(J2024, J2024 + 31)
+
+    calls = _record_calls(monkeypatch, calc, '_solve_boundaries')
+    old = calc.build_transition_index(J1960, J1960 + 31)
+
+    assert sum(end - start for _, start, end in calls) <= 31
+    assert len(old) < 150  # ~4 padas a day
+    assert astro_engine._TRANSITION_INDEXES['LAHIRI'] == [old, recent]
+    assert calc.get_transition_index(J2024, J2024 + 31) is recent
+    assert calc.get_transition_index(J1960 + 1, J1960 + 2) is old
+
+
+def test_overlapping_window_extends_the_touching_index(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_TRANSITION_INDEXES', {})
+    calc = AstroCalculator(almanac_path=None)
+    calc.build_transition_index(J1960, J1960 + 31)
+    calc.build_transition_index(J2024, J2024 + 31)
+    index = calc.build_transition_index(J2024 + 20, J2024 + 40)
+
+    assert index.jd_start == J2024 and index.jd_end == J2024 + 40
+    assert len(astro_engine._TRANSITION_INDEXES['LAHIRI']) == 2
+    assert calc.get_nakshatra_at(J2024 + 35)['index'] == calc.get_nakshatra(calc.get_moon_position(J2024 + 35))['index']
+
+
+def test_distant_station_window_gets_its_own_index(monkeypatch):
+    monkeypatch.setattr(astro_engine, '_STATION_INDEXES', {})
+    calc = AstroCalculator(almanac_path=None)
+    calc.build_station_index(J2024, J2024 + 60, ['Mercury'])
+
+    calls = _record_calls(monkeypatch, calc, '_planet_speed')
+    old = calc.build_station_index(J1960, J1960 + 60, ['Mercury'])['Mercury']
+
+    assert len(calls) < 100  # 16 samples plus a few solver steps per station
+    assert (old.jd_start, old.jd_end) == (J1960, J1960 + 60)
+    assert len(astro_engine._STATION_INDEXES[('LAHIRI', 'Mercury')]) == 2